@@ -0,0 +1,96 @@
+"""Measures the memory cached members and users take, as raw payloads and as models.
+
+Run from the repository root::
+
+    python benchmarks/cache_memory.py [count]
+
+Payloads go through a JSON round trip first, as they would coming off the
+gateway, and tracemalloc counts everything allocated while they're decoded or
+built into models.
+
+Only the model modules are loaded, not the package ``__init__``, so the
+client's dependencies don't need to be importable.
+"""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import random
+import sys
+import tracemalloc
+import types
+from typing import Any, Callable
+
+_PACKAGE = pathlib.Path(__file__).resolve().parent.parent / "nextvolt"
+
+if "nextvolt" not in sys.modules:
+    # an empty package whose submodules are found in the source tree
+    _package = types.ModuleType("nextvolt")
+    _package.__path__ = [str(_PACKAGE)]
+    sys.modules["nextvolt"] = _package
+
+from nextvolt.member import Member  # noqa: E402
+from nextvolt.user import User  # noqa: E402
+
+_ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def _random_id() -> str:
+    return "01H" + "".join(random.choices(_ULID_ALPHABET, k=23))
+
+
+def _member_payloads(count: int, user_ids: list[str]) -> str:
+    server_ids = [_random_id() for _ in range(5)]
+    role_ids = [_random_id() for _ in range(20)]
+
+    return json.dumps([
+        {
+            "_id": {"server": server_ids[i % len(server_ids)], "user": user_ids[i]},
+            "joined_at": "2023-01-01T00:00:00.000Z",
+            "roles": random.sample(role_ids, 2),
+        }
+        for i in range(count)
+    ])
+
+
+def _user_payloads(count: int, user_ids: list[str]) -> str:
+    return json.dumps([
+        {
+            "_id": user_ids[i],
+            "username": f"user{i}",
+            "discriminator": f"{i % 10000:04d}",
+            "online": True,
+            "status": {"presence": "Online"},
+        }
+        for i in range(count)
+    ])
+
+
+def _traced(build: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        result = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    del result
+    return size
+
+
+def main(count: int = 100_000) -> None:
+    random.seed(0)
+    user_ids = [_random_id() for _ in range(count)]
+
+    for name, encoded, model in (
+        ("member", _member_payloads(count, user_ids), Member),
+        ("user", _user_payloads(count, user_ids), User),
+    ):
+        raw = _traced(lambda: json.loads(encoded))
+        built = _traced(lambda: [model(None, payload) for payload in json.loads(encoded)])  # type: ignore
+        print(f"{name:<7} {raw / count:6.0f} B as a dict  {built / count:6.0f} B as a {model.__name__}  ({built / raw:.0%})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -1,7 +1,21 @@
 __version__ = '0.1.0-dev'
 
+from .activity import *
+from .asset import *
+from .channel import *
 from .client import *
+from .emoji import *
+from .enums import *
 from .errors import *
+from .file import *
+from .flags import *
 from .gateway import *
 from .types import *
-from .http import *
\ No newline at end of file
+from .http import *
+from .iterators import *
+from .member import *
+from .message import *
+from .role import *
+from .server import *
+from .user import *
+from .utils import *
\ No newline at end of file
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from .message import Message
+
+__all__ = ("TypingCoalescer", "ReactionBatch", "ReactionBatcher")
+
+
+class _Typing:
+    __slots__ = ("stopping", "handle")
+
+    def __init__(self) -> None:
+        self.stopping: bool = False
+        self.handle: Optional[asyncio.TimerHandle] = None
+
+
+class TypingCoalescer:
+    """Debounces typing events per (channel, user).
+
+    The first ``ChannelStartTyping`` emits ``typing_start``; repeats while the
+    user keeps typing are absorbed. A ``ChannelStopTyping`` only emits
+    ``typing_stop`` if the user doesn't start again within ``window`` seconds,
+    and a user who goes quiet for ``timeout`` seconds without a stop is
+    stopped anyway. Each burst of typing thus yields one start/stop pair.
+
+    Every ``window`` seconds with typing in a channel, ``on_activity`` gets the
+    channel id and the ids of the users who typed there in that window.
+    """
+
+    __slots__ = ("window", "timeout", "_on_typing", "_on_activity", "_typing", "_activity")
+
+    def __init__(
+        self,
+        on_typing: Callable[[str, str, str], None],
+        on_activity: Callable[[str, list[str]], None],
+        *,
+        window: float,
+        timeout: float = 10.0
+    ) -> None:
+        self.window: float = window
+        self.timeout: float = max(timeout, window)
+        self._on_typing = on_typing
+        self._on_activity = on_activity
+
+        self._typing: dict[tuple[str, str], _Typing] = {}
+        # channel id -> users who typed in the current window, in order
+        self._activity: dict[str, dict[str, None]] = {}
+
+    def start(self, channel_id: str, user_id: str) -> None:
+        key = (channel_id, user_id)
+        entry = self._typing.get(key)
+
+        if entry is None:
+            entry = self._typing[key] = _Typing()
+            self._on_typing("typing_start", channel_id, user_id)
+        elif entry.handle is not None:
+            entry.handle.cancel()
+
+        entry.stopping = False
+        entry.handle = asyncio.get_running_loop().call_later(self.timeout, self._expire, key)
+
+        users = self._activity.get(channel_id)
+        if users is None:
+            users = self._activity[channel_id] = {}
+            asyncio.get_running_loop().call_later(self.window, self._flush_activity, channel_id)
+        users[user_id] = None
+
+    def stop(self, channel_id: str, user_id: str) -> None:
+        entry = self._typing.get((channel_id, user_id))
+        if entry is None or entry.stopping:
+            return
+
+        if entry.handle is not None:
+            entry.handle.cancel()
+
+        entry.stopping = True
+        entry.handle = asyncio.get_running_loop().call_later(self.window, self._expire, (channel_id, user_id))
+
+    def clear(self) -> None:
+        for entry in self._typing.values():
+            if entry.handle is not None:
+                entry.handle.cancel()
+
+        self._typing.clear()
+        self._activity.clear()
+
+    def _expire(self, key: tuple[str, str]) -> None:
+        if self._typing.pop(key, None) is not None:
+            self._on_typing("typing_stop", *key)
+
+    def _flush_activity(self, channel_id: str) -> None:
+        users = self._activity.pop(channel_id, None)
+        if users:
+            self._on_activity(channel_id, list(users))
+
+
+class ReactionBatch:
+    """The net reaction changes to one message over a batching window.
+
+    ``cleared`` holds the emojis whose reactions were removed entirely; apply
+    those first, then ``added`` and ``removed``, both mapping an emoji to user
+    ids. A reaction added and removed again within the window appears in
+    neither. ``message`` is the cached message, if any, already up to date.
+    """
+
+    __slots__ = ("message_id", "channel_id", "message", "_added", "_removed", "_cleared")
+
+    def __init__(self, message_id: str, channel_id: str) -> None:
+        self.message_id: str = message_id
+        self.channel_id: str = channel_id
+        self.message: Optional[Message] = None
+
+        self._added: dict[str, dict[str, None]] = {}
+        self._removed: dict[str, dict[str, None]] = {}
+        self._cleared: dict[str, None] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"<ReactionBatch message_id={self.message_id!r} added={len(self)} "
+            f"removed={sum(map(len, self._removed.values()))} cleared={len(self._cleared)}>"
+        )
+
+    def __len__(self) -> int:
+        return sum(map(len, self._added.values()))
+
+    def __bool__(self) -> bool:
+        return bool(self._added or self._removed or self._cleared)
+
+    @property
+    def added(self) -> dict[str, list[str]]:
+        return {emoji_id: list(users) for emoji_id, users in self._added.items()}
+
+    @property
+    def removed(self) -> dict[str, list[str]]:
+        return {emoji_id: list(users) for emoji_id, users in self._removed.items()}
+
+    @property
+    def cleared(self) -> list[str]:
+        return list(self._cleared)
+
+    def _add(self, emoji_id: str, user_id: str) -> None:
+        if not _discard(self._removed, emoji_id, user_id):
+            self._added.setdefault(emoji_id, {})[user_id] = None
+
+    def _remove(self, emoji_id: str, user_id: str) -> None:
+        if not _discard(self._added, emoji_id, user_id):
+            self._removed.setdefault(emoji_id, {})[user_id] = None
+
+    def _clear(self, emoji_id: str) -> None:
+        # anything that happened to the emoji so far is superseded
+        self._added.pop(emoji_id, None)
+        self._removed.pop(emoji_id, None)
+        self._cleared[emoji_id] = None
+
+
+def _discard(reactions: dict[str, dict[str, None]], emoji_id: str, user_id: str) -> bool:
+    users = reactions.get(emoji_id)
+    if users is None or user_id not in users:
+        return False
+
+    del users[user_id]
+    if not users:
+        del reactions[emoji_id]
+    return True
+
+
+class ReactionBatcher:
+    """Groups reaction events per message over a ``window`` of seconds.
+
+    The first reaction event for a message opens a batch; when the window
+    closes, ``on_batch`` receives its net :class:`ReactionBatch`, so a burst of
+    reactions costs one dispatch instead of one per event.
+    """
+
+    __slots__ = ("window", "_on_batch", "_batches")
+
+    def __init__(self, on_batch: Callable[[ReactionBatch], None], *, window: float) -> None:
+        self.window: float = window
+        self._on_batch = on_batch
+        self._batches: dict[str, tuple[ReactionBatch, asyncio.TimerHandle]] = {}
+
+    def add(self, message_id: str, channel_id: str, emoji_id: str, user_id: str) -> None:
+        self._get(message_id, channel_id)._add(emoji_id, user_id)
+
+    def remove(self, message_id: str, channel_id: str, emoji_id: str, user_id: str) -> None:
+        self._get(message_id, channel_id)._remove(emoji_id, user_id)
+
+    def clear_emoji(self, message_id: str, channel_id: str, emoji_id: str) -> None:
+        self._get(message_id, channel_id)._clear(emoji_id)
+
+    def clear(self) -> None:
+        for _, handle in self._batches.values():
+            handle.cancel()
+
+        self._batches.clear()
+
+    def _get(self, message_id: str, channel_id: str) -> ReactionBatch:
+        entry = self._batches.get(message_id)
+        if entry is not None:
+            return entry[0]
+
+        batch = ReactionBatch(message_id, channel_id)
+        handle = asyncio.get_running_loop().call_later(self.window, self._flush, message_id)
+        self._batches[message_id] = (batch, handle)
+        return batch
+
+    def _flush(self, message_id: str) -> None:
+        entry = self._batches.pop(message_id, None)
+        if entry is not None and entry[0]:
+            self._on_batch(entry[0])
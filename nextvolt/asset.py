@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, IO, Any, AsyncIterator, Optional, Union
+
+if TYPE_CHECKING:
+    from .state import ConnectionState
+    from .types.file import FilePayload
+
+__all__ = ("Asset",)
+
+
+class Asset:
+    """A file stored on Autumn, such as an attachment, avatar or icon."""
+
+    __slots__ = ("_state", "_data", "id", "tag", "filename", "size", "content_type")
+
+    def __init__(self, state: ConnectionState, data: FilePayload) -> None:
+        self._state: ConnectionState = state
+        self._data: FilePayload = data
+
+        self.id: str = data["_id"]
+        self.tag: str = data["tag"]
+        self.filename: str = data["filename"]
+        self.size: int = data["size"]
+        self.content_type: str = data["content_type"]
+
+    def __repr__(self) -> str:
+        return f"<Asset id={self.id!r} tag={self.tag!r} filename={self.filename!r}>"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Asset) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    @property
+    def url(self) -> str:
+        return self._state.http.asset_url(self._data)
+
+    @property
+    def type(self) -> str:
+        return self._data["metadata"]["type"]
+
+    @property
+    def width(self) -> Optional[int]:
+        return self._data["metadata"].get("width")
+
+    @property
+    def height(self) -> Optional[int]:
+        return self._data["metadata"].get("height")
+
+    def stream(self, *, start: int = 0) -> AsyncIterator[bytes]:
+        return self._state.http.stream_asset(self._data, start=start)
+
+    async def read(self) -> bytes:
+        return await self._state.http.request_file(self.url)
+
+    async def save(self, fp: Union[str, os.PathLike[str], IO[bytes]], *, resume: bool = False) -> int:
+        return await self._state.http.download_asset(self._data, fp, resume=resume)
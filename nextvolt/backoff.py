@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import random
+
+__all__ = ("ExponentialBackoff",)
+
+
+class ExponentialBackoff:
+    """Exponential backoff with full jitter.
+
+    Each call to :meth:`delay` doubles the upper bound, starting at ``base`` and
+    capped at ``maximum``, and returns a random delay between zero and that bound
+    so that many clients reconnecting at once don't retry in lockstep.
+    """
+
+    __slots__ = ("base", "maximum", "_exp", "_max_exp", "_random")
+
+    def __init__(self, base: float = 1.0, *, maximum: float = 60.0) -> None:
+        self.base: float = base
+        self.maximum: float = maximum
+
+        self._exp: int = 0
+        # past this exponent the bound is always ``maximum``
+        self._max_exp: int = max(0, (int(maximum / base) if base > 0 else 0).bit_length())
+        self._random = random.Random()
+
+    @property
+    def attempts(self) -> int:
+        """How many delays have been handed out since the last reset."""
+        return self._exp
+
+    def delay(self) -> float:
+        bound = min(self.maximum, self.base * 2 ** min(self._exp, self._max_exp))
+        self._exp += 1
+        return self._random.uniform(0, bound)
+
+    def reset(self) -> None:
+        self._exp = 0
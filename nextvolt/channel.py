@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import copy
+import datetime
+import sys
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from .asset import Asset
+from .iterators import HistoryIterator
+
+if TYPE_CHECKING:
+    from .server import Server
+    from .state import ConnectionState
+    from .types import Channel as ChannelPayload
+    from .types.file import FilePayload
+    from .user import User
+
+__all__ = ("Channel",)
+
+
+class Channel:
+    """A channel of any type: saved messages, DM, group, text or voice.
+
+    Fields that don't apply to the channel's ``type`` are ``None``.
+    """
+
+    __slots__ = (
+        "_state",
+        "id",
+        "type",
+        "name",
+        "server_id",
+        "description",
+        "recipient_ids",
+        "owner_id",
+        "last_message_id",
+        "active",
+        "nsfw",
+        "permissions",
+        "default_permissions",
+        "role_permissions",
+        "_icon",
+    )
+
+    def __init__(self, state: ConnectionState, data: ChannelPayload) -> None:
+        self._state: ConnectionState = state
+
+        self.id: str = sys.intern(data["_id"])
+        self.type: str = sys.intern(data["channel_type"])
+        self.name: Optional[str] = None
+        self.server_id: Optional[str] = None
+        self.description: Optional[str] = None
+        self.recipient_ids: tuple[str, ...] = ()
+        # the owner of a group, or the user of a saved messages channel
+        self.owner_id: Optional[str] = None
+        self.last_message_id: Optional[str] = None
+        self.active: bool = False
+        self.nsfw: bool = False
+        self.permissions: Optional[int] = None
+        self.default_permissions: Optional[tuple[int, int]] = None
+        self.role_permissions: Optional[dict[str, tuple[int, int]]] = None
+        self._icon: Optional[FilePayload] = None
+
+        self._update(data)
+
+    def __repr__(self) -> str:
+        return f"<Channel id={self.id!r} type={self.type!r} name={self.name!r}>"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Channel) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def _update(self, data: dict[str, Any], clear: Union[str, list[str], None] = None) -> None:
+        if "name" in data:
+            self.name = data["name"]
+        if "server" in data:
+            self.server_id = sys.intern(data["server"])
+        if "description" in data:
+            self.description = data["description"]
+        if "recipients" in data:
+            self.recipient_ids = tuple(sys.intern(user_id) for user_id in data["recipients"])
+        if "owner" in data:
+            self.owner_id = sys.intern(data["owner"])
+        if "user" in data:
+            self.owner_id = sys.intern(data["user"])
+        if "last_message_id" in data:
+            self.last_message_id = data["last_message_id"]
+        if "active" in data:
+            self.active = data["active"]
+        if "nsfw" in data:
+            self.nsfw = data["nsfw"]
+        if "permissions" in data:
+            self.permissions = data["permissions"]
+        if "default_permissions" in data:
+            self.default_permissions = (data["default_permissions"]["a"], data["default_permissions"]["d"])
+        if "role_permissions" in data:
+            self.role_permissions = {
+                sys.intern(role_id): (override["a"], override["d"])
+                for role_id, override in data["role_permissions"].items()
+            }
+        if "icon" in data:
+            self._icon = data["icon"]
+
+        if clear:
+            for field in [clear] if isinstance(clear, str) else clear:
+                if field == "Icon":
+                    self._icon = None
+                elif field == "Description":
+                    self.description = None
+                elif field == "DefaultPermissions":
+                    self.default_permissions = None
+
+    def _copy(self) -> Channel:
+        return copy.copy(self)
+
+    def _add_recipient(self, user_id: str) -> None:
+        if user_id not in self.recipient_ids:
+            self.recipient_ids = self.recipient_ids + (sys.intern(user_id),)
+
+    def _remove_recipient(self, user_id: str) -> None:
+        if user_id in self.recipient_ids:
+            self.recipient_ids = tuple(recipient for recipient in self.recipient_ids if recipient != user_id)
+
+    @property
+    def server(self) -> Optional[Server]:
+        return self._state.get_server(self.server_id) if self.server_id is not None else None
+
+    @property
+    def recipients(self) -> list[User]:
+        get_user = self._state.get_user
+        return [user for user in map(get_user, self.recipient_ids) if user is not None]
+
+    @property
+    def icon(self) -> Optional[Asset]:
+        return Asset(self._state, self._icon) if self._icon is not None else None
+
+    @property
+    def mention(self) -> str:
+        return f"<#{self.id}>"
+
+    def history(
+        self,
+        *,
+        limit: Optional[int] = 100,
+        before: Union[str, datetime.datetime, None] = None,
+        after: Union[str, datetime.datetime, None] = None,
+        oldest_first: bool = False
+    ) -> HistoryIterator:
+        """Returns an async iterator over the channel's messages. ``limit=None`` fetches all of them."""
+        return HistoryIterator(
+            self._state, self.id, limit=limit, before=before, after=after, oldest_first=oldest_first
+        )
@@ -1,72 +1,166 @@
 from __future__ import annotations
 
 import asyncio 
+import datetime
 import logging
-from typing import TYPE_CHECKING, Any, Callable, Coroutine, Literal, Optional, TypeVar, Union, cast, overload
+import aiohttp
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Dict, Iterable, List, Literal, Optional, Tuple, TypeVar, Union, cast, overload
 from typing_extensions import ParamSpec
 
+from .backoff import ExponentialBackoff
+from .dispatcher import EventScheduler
+from .gateway import RevoltWebSocket, WebSocketEventParsers
+from .channel import Channel
+from .emoji import Emoji
 from .http import HTTPClient
+from .iterators import HistoryIterator
+from .state import ConnectionState
 from .invite import Invite
+from .member import Member, MemberCachePolicy
+from .message import Message
 from .server import Server
 from .user import ClientUser, User
-from .utils import MISSING
+from .errors import ClientException, ConnectionClosed
+from .flags import Intents
+from .utils import HAS_MSGPACK, MISSING
+from .waiters import WaiterRegistry
 
 
 __all__ = ("Client",)
 
 _log = logging.getLogger(__name__)
 
+CoroFunc = Callable[..., Coroutine[Any, Any, Any]]
+
+# gateway events that only produce client events and don't touch the cache, so
+# they can be dropped undecoded while nothing listens to those client events
+_CACHELESS_EVENTS: Dict[str, Tuple[str, ...]] = {
+    # either typing event can produce any of these once typing is coalesced
+    "ChannelStartTyping": ("typing_start", "typing_stop", "channel_activity"),
+    "ChannelStopTyping": ("typing_start", "typing_stop", "channel_activity"),
+}
+
 
 class Client:
     def __init__(
         self,
         *,
         max_messages: Optional[int] = MISSING,
-        api_url: Optional[str] = "https://api.revolt.chat"
+        api_url: Optional[str] = "https://api.revolt.chat",
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        http_options: Optional[Dict[str, Any]] = None,
+        max_messages_per_channel: Optional[int] = None,
+        message_cache_policy: Literal["fifo", "lru"] = "fifo",
+        member_cache_policy: Optional[MemberCachePolicy] = None,
+        ready_chunk_size: int = 1000,
+        disabled_events: Optional[Iterable[str]] = None,
+        intents: Optional[Intents] = None,
+        typing_coalesce_window: Optional[float] = None,
+        reaction_batch_window: Optional[float] = None,
+        gateway_format: Literal["json", "msgpack"] = "json",
+        heartbeat_interval: float = 15.0,
+        heartbeat_timeout: Optional[float] = None,
+        dispatch_workers: int = 32,
+        max_pending_events: int = 10000,
+        event_overflow: Literal["block", "drop_oldest", "drop_newest"] = "block",
+        event_concurrency: Optional[Dict[str, int]] = None,
+        reconnect_base_delay: float = 1.0,
+        reconnect_max_delay: float = 60.0,
+        max_reconnect_attempts: Optional[int] = None
     ) -> None:
         self.max_messages: int = 1000 if max_messages is MISSING else max_messages
+
+        if gateway_format == "msgpack" and not HAS_MSGPACK:
+            raise ClientException("The msgpack gateway format requires the msgpack package to be installed.")
+        self.gateway_format: Literal["json", "msgpack"] = gateway_format
+        self.heartbeat_interval: float = heartbeat_interval
+        # defaults to twice the interval
+        self.heartbeat_timeout: Optional[float] = heartbeat_timeout
+        # reconnect backoff: full jitter between 0 and min(max_delay, base * 2 ** attempt)
+        self.reconnect_base_delay: float = reconnect_base_delay
+        self.reconnect_max_delay: float = reconnect_max_delay
+        # None retries forever
+        self.max_reconnect_attempts: Optional[int] = max_reconnect_attempts
         try:
             self.loop: asyncio.AbstractEventLoop = loop or asyncio.get_running_loop()
         except RuntimeError:
             self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
-        self._listeners: Dict[str, List[Tuple[asyncio.Future, Callable[..., bool]]]] = {}
+        # the last waiter for an event going away may let its gateway events be skipped again
+        self._waiters: WaiterRegistry = WaiterRegistry(on_empty=lambda event: self._update_subscriptions())
+        # event_concurrency caps concurrent handlers per event, e.g. {"message": 4}
+        self._scheduler: EventScheduler = EventScheduler(
+            self._run_event,
+            workers=dispatch_workers,
+            max_pending=max_pending_events,
+            overflow=event_overflow,
+            limits=event_concurrency
+        )
+        # listeners added with listen()/add_listener(), keyed by event name without the on_ prefix
         self.extra_events: Dict[str, List[CoroFunc]] = {}
+        # event name -> every handler to run for it, rebuilt whenever a listener changes
+        self._handlers: Dict[str, List[CoroFunc]] = {}
+        for attr in dir(type(self)):
+            if attr.startswith('on_') and attr != 'on_error':
+                self._rebuild_handlers(attr[3:])
 
         self._closed: bool = False
-        self._ready: asyncio.Event = MISSING
+        self._ready: asyncio.Event = asyncio.Event()
+        # whether a Ready has been received before, so later ones are reconnects
+        self._was_ready: bool = False
         
-        self.internal_server_id = internal_server_id
         self.ws: Optional[RevoltWebSocket] = None
-        self.http: HTTPClient = HTTPClient(api_url=api_url, loop=self.loop)
+        # connection pool tuning (limit, limit_per_host, dns_cache_ttl, keepalive_timeout, ...)
+        self.http: HTTPClient = HTTPClient(api_url=api_url, loop=self.loop, connector=connector, **(http_options or {}))
+        self.state: ConnectionState = ConnectionState(
+            self,
+            self.http,
+            max_messages=self.max_messages or 0,
+            max_messages_per_channel=max_messages_per_channel,
+            message_cache_policy=message_cache_policy,
+            # defaults to caching every member
+            member_cache_policy=member_cache_policy,
+            ready_chunk_size=ready_chunk_size,
+            # seconds; merges each user's typing bursts into one typing_start/typing_stop pair
+            typing_coalesce_window=typing_coalesce_window,
+            # seconds; replaces the per-reaction events with one reaction_batch per message
+            reaction_batch_window=reaction_batch_window
+        )
+        self.intents: Intents = intents or Intents.all()
+        # gateway event types (e.g. "ChannelStartTyping") in disabled_events are dropped unparsed
+        self._disabled_events: frozenset[str] = frozenset(disabled_events or ()) | self.intents.disabled_events
+        self.parsers: WebSocketEventParsers = WebSocketEventParsers(self.state)
+        self.parsers.disable(*self._disabled_events)
+        self._update_subscriptions()
 
     @property
     def user(self) -> Optional[User]:
-        return self.http.user
+        return self.state.user
     
     @property
     def user_id(self) -> Optional[str]:
-        return self.http.my_id
+        return self.state.user_id
     
     @property
-    def servers(self) -> Dict[str, Server]:
-        return list(self.http.servers.values())
+    def servers(self) -> List[Server]:
+        return self.state.servers
     
     @property
-    def users(self) -> Dict[str, User]:
-        return list(self.http.users.values())
+    def users(self) -> List[User]:
+        return self.state.users
     
     @property
-    def dm_channels(self) -> Dict[str, Channel]:
-        return list(self.http.private_dms.values())
+    def dm_channels(self) -> List[Channel]:
+        return self.state.private_channels
     
     @property
-    def emojis(self) -> Dict[str, Emoji]:
-        return list(self.http.emojis.values())
+    def emojis(self) -> List[Emoji]:
+        return self.state.emojis
 
     @property
-    def guilds(self) -> Dict[str, Guild]:
-        return list(self.http.servers.values())
+    def guilds(self) -> List[Server]:
+        return self.state.servers
     
     @property
     def latency(self) -> float:
@@ -79,28 +173,56 @@ class Client:
     def is_ready(self) -> bool:
         return self._ready.is_set()
     
+    def get_user(self, user_id: str) -> Optional[User]:
+        return self.state.get_user(user_id)
+
+    def get_server(self, server_id: str) -> Optional[Server]:
+        return self.state.get_server(server_id)
+
+    def get_channel(self, channel_id: str) -> Optional[Channel]:
+        return self.state.get_channel(channel_id)
+
+    def get_member(self, server_id: str, user_id: str) -> Optional[Member]:
+        return self.state.get_member(server_id, user_id)
+
+    def get_emoji(self, emoji_id: str) -> Optional[Emoji]:
+        return self.state.get_emoji(emoji_id)
+
     async def fetch_user(self, user_id: str) -> User:
         payload = await self.http.fetch_user(user_id)
-        return User(payload)
+        return User(self.state, payload)
     
     async def fetch_dm_channels(self) -> List[Channel]:
         channel_payloads = await self.http.fetch_dm_channels()
-        return cast(list[Union[DMChannel, GroupDMChannel]], [channel_factory(payload, self.state) for payload in channel_payloads])
+        return [Channel(self.state, payload) for payload in channel_payloads]
 
-    async def fetch_channel(self, channel_id: str) -> Union[DMChannel, GroupDMChannel, SavedMessageChannel, TextChannel, VoiceChannel]:
+    async def fetch_channel(self, channel_id: str) -> Channel:
         payload = await self.http.fetch_channel(channel_id)
+        return Channel(self.state, payload)
 
-        return channel_factory(payload, self.state)
+    def history(
+        self,
+        channel_id: str,
+        *,
+        limit: Optional[int] = 100,
+        before: Union[str, datetime.datetime, None] = None,
+        after: Union[str, datetime.datetime, None] = None,
+        oldest_first: bool = False
+    ) -> HistoryIterator:
+        """Returns an async iterator over the channel's messages. ``limit=None`` fetches all of them."""
+        return HistoryIterator(
+            self.state, channel_id, limit=limit, before=before, after=after, oldest_first=oldest_first
+        )
 
     async def fetch_invite(self, code: str) -> Invite:
         payload = await self.http.fetch_invite(code)
         return Invite(payload, code, self.state)
 
     def get_message(self, message_id: str) -> Message:
-        for message in self.state.messages:
-            if message.id == message_id:
-                return message
-        raise LookupError
+        message = self.state.get_message(message_id)
+        if message is None:
+            raise LookupError(message_id)
+        return message
 
     async def edit_self(self, **kwargs: Any) -> None:
         if kwargs.get("avatar", Missing) is None:
@@ -138,13 +260,23 @@ class Client:
 
     async def fetch_emoji(self, emoji_id: str) -> Emoji:
         emoji = await self.state.http.fetch_emoji(emoji_id)
-        return Emoji(emoji, self.state)
+        return Emoji(self.state, emoji)
 
     async def upload_file(self, file: File, tag: Literal['attachments', 'avatars', 'backgrounds', 'icons', 'banners', 'emojis']) -> Ulid:
         asset = await self.http.upload_file(file, tag)
         ulid = Ulid()
         ulid.id = asset["id"]
         return ulid
+
+    async def upload_files(
+        self,
+        files: List[File],
+        tag: Literal['attachments', 'avatars', 'backgrounds', 'icons', 'banners', 'emojis'],
+        *,
+        concurrency: Optional[int] = None
+    ) -> List[str]:
+        """Uploads several files concurrently and returns their asset ids in input order."""
+        return await self.http.upload_files(files, tag, concurrency=concurrency)
     
     async def fetch_servers(self) -> List[Server]:
         server_payloads = await self.http.fetch_servers()
@@ -152,6 +284,9 @@ class Client:
     async def on_ready(self) -> None:
         pass
 
+    async def on_resumed(self) -> None:
+        pass
+
     async def on_message(self, message: revolt.Message) -> None:
         pass
 
@@ -182,6 +317,9 @@ class Client:
     async def on_typing_stop(self, channel: revolt.Channel, user: revolt.User) -> None:
         pass
 
+    async def on_channel_activity(self, channel: revolt.Channel, users: List[revolt.User]) -> None:
+        pass
+
     async def on_server_update(self, before: revolt.Server, after: revolt.Server) -> None:
         pass
 
@@ -230,135 +368,265 @@ class Client:
     async def on_raw_reaction_clear(self, payload: revolt.types.MessageRemoveReactionEventPayload) -> None:
         pass
 
-    async def on_reaction_clear(self, message: revolt.Message, user: revolt.User, emoji_id: str) -> None:
+    async def on_reaction_clear(self, message: revolt.Message, emoji_id: str) -> None:
         pass
 
-    async def raw_bulk_message_delete(self, payload: revolt.types.BulkMessageDeleteEventPayload) -> None:
+    async def on_reaction_batch(self, batch: revolt.ReactionBatch) -> None:
         pass
 
-    async def bulk_message_delete(self, messages: list[revolt.Message]) -> None:
+    async def on_raw_bulk_message_delete(self, payload: revolt.types.BulkMessageDeleteEventPayload) -> None:
+        pass
+
+    async def on_bulk_message_delete(self, messages: List[revolt.Message]) -> None:
         pass
     
+    def _rebuild_handlers(self, event: str) -> None:
+        handlers: List[CoroFunc] = []
+
+        method = getattr(self, 'on_' + event, None)
+        # the defaults below do nothing, so only overrides count as handlers
+        if (
+            method is not None
+            and asyncio.iscoroutinefunction(method)
+            and getattr(type(self), 'on_' + event) is not getattr(Client, 'on_' + event, None)
+        ):
+            handlers.append(method)
+
+        handlers.extend(self.extra_events.get(event, ()))
+
+        if handlers:
+            self._handlers[event] = handlers
+        else:
+            self._handlers.pop(event, None)
+
+    @staticmethod
+    def _event_name(name: str) -> str:
+        name = name.lower()
+        return name[3:] if name.startswith('on_') else name
+
+    def add_listener(self, func: CoroFunc, name: Optional[str] = None) -> None:
+        """Registers an extra handler for an event.
+
+        ``name`` defaults to the function's name; a leading ``on_`` is optional.
+        Any number of listeners can subscribe to the same event, alongside the
+        client's own ``on_<event>`` method.
+        """
+
+        if not asyncio.iscoroutinefunction(func):
+            raise TypeError('Listeners must be coroutine functions')
+
+        event = self._event_name(name or func.__name__)
+        self.extra_events.setdefault(event, []).append(func)
+        self._rebuild_handlers(event)
+        self._update_subscriptions()
+
+    def remove_listener(self, func: CoroFunc, name: Optional[str] = None) -> None:
+        """Removes a handler registered with :meth:`add_listener` or :meth:`listen`."""
+
+        event = self._event_name(name or func.__name__)
+        listeners = self.extra_events.get(event)
+        if not listeners:
+            return
+
+        try:
+            listeners.remove(func)
+        except ValueError:
+            return
+
+        if not listeners:
+            del self.extra_events[event]
+        self._rebuild_handlers(event)
+        self._update_subscriptions()
+
+    def _is_handled(self, event: str) -> bool:
+        """Whether dispatching ``event`` would reach a handler or a waiter."""
+        return event in self._handlers or event in self._waiters
+
+    def _update_subscriptions(self) -> None:
+        # Recomputed whenever a listener or waiter is added or removed, so it's
+        # up to date from startup on.
+        raw = self._is_handled('socket_raw_receive')
+
+        for gateway_event, events in _CACHELESS_EVENTS.items():
+            if gateway_event in self._disabled_events:
+                continue
+
+            if raw or any(map(self._is_handled, events)):
+                self.parsers.enable(gateway_event)
+            else:
+                self.parsers.disable(gateway_event)
+
+    def listen(self, name: Optional[str] = None) -> Callable[[CoroFunc], CoroFunc]:
+        """A decorator that registers the decorated coroutine as an event listener.
+
+        .. code-block:: python
+
+            @client.listen('message')
+            async def log_message(message):
+                ...
+        """
+
+        def decorator(func: CoroFunc) -> CoroFunc:
+            self.add_listener(func, name)
+            return func
+
+        return decorator
+
     def wait_for(
         self,
         event: str,
         *,
         check: Optional[Callable[..., bool]] = None,
         timeout: Optional[float] = None,
+        channel: Optional[Any] = None,
+        author: Optional[Any] = None,
+        message: Optional[Any] = None,
     ) -> Any:
-        """Waits for a WebSocket event to be dispatched in Revolt."""
-        
-        future = self.loop.create_future()
-        
-        if check is None:
-            def _check(*args):
-                return True
-            check = _check
+        """Waits for a WebSocket event to be dispatched in Revolt.
 
-        ev = event.lower()
-        
-        listeners = self._listeners.setdefault(ev, [])
-        listeners.append((future, check))
+        ``channel``, ``author`` and ``message`` (ids or objects with an ``id``) narrow
+        the wait down to events about them and are matched through an index, so
+        prefer them over doing the same comparison inside ``check``.
+        """
         
+        future = self.loop.create_future()
+        self._waiters.add(event.lower(), future, check, channel=channel, author=author, message=message)
+        self._update_subscriptions()
         return asyncio.wait_for(future, timeout)
 
     async def _run_event(self, coro: Coroutine, event_name: str, *args: Any, **kwargs: Any) -> None:
         """Executes an event coroutine and handles errors."""
+        # cancellation propagates so the scheduler's workers can stop
         try:
             await coro(*args, **kwargs)
-        except asyncio.CancelledError:
-            pass
         except Exception as e:
-            try:
-                await self.on_error(event_name, e, *args, **kwargs)
-            except asyncio.CancelledError:
-                pass
+            await self.on_error(event_name, e, *args, **kwargs)
+
+    def _schedule_event(self, coro: Callable[..., Coroutine], event_name: str, *args: Any, **kwargs: Any) -> None:
+        self._scheduler.submit(coro, event_name, *args, **kwargs)
+
+    async def on_error(self, event_method: str, error: Exception, *args: Any, **kwargs: Any) -> None:
+        _log.exception('Ignoring exception in %s', event_method, exc_info=error)
     
-    def start(self, token: str = None, *, reconnect: bool = True) -> None:
+    async def start(self, token: str = None, *, reconnect: bool = True) -> None:
         self.http.token = token or self.http.token
         if not self.http.token:
             raise ClientException("Token is missing.. Are you a bit lose in the head?")
         
-        self.http.session = aiohttp.ClientSession()
-        self.connect(self, reconnect=reconnect)
+        self.loop = asyncio.get_running_loop()
+        await self.http.start()
+        await self.connect(reconnect=reconnect)
 
-        
-    async def _connect(self, token: str = None, *, reconnect: bool = True) -> None:
-        self.http.token = token or self.http.token
-        if not self.http.token:
-            raise ClientException("Token is missing.. Are you a bit lose in the head?")
+    def _handle_ready(self, *, resumed: bool = False) -> None:
+        self._ready.set()
 
-        while not self._closed:
-            ws_build = RevoltWebSocket.build(self, loop=self.loop)
-            rws = await asyncio.wait_for(ws_build, timeout=60)
-            if type(rws) != RevoltWebSocket:
-                self.dispatch('error', rws)
-                return
-            
-            self.ws = rws
-            self.http.ws = self.ws
-            self.dispatch('connect')
-
-    def dispatch(self, event: Union[str, BaseEvent], *args: Any, **kwargs: Any) -> None:
-        if isinstance(event, BaseEvent):
-            event_name = event.__dispatch_event__
-            args = (event,)
+        if resumed:
+            self.dispatch('resumed')
         else:
-            event_name = event
-
-        log.debug('Dispatching event %s', event_name)
-        method = 'on_' + event_name
-
-        listeners = self._listeners.get(event_name)
-        if listeners:
-            removed = []
-            for i, (future, condition) in enumerate(listeners):
-                if future.cancelled():
-                    removed.append(i)
-                    continue
-
-                try:
-                    result = condition(*args)
-                except Exception as exc:
-                    future.set_exception(exc)
-                    removed.append(i)
-                else:
-                    if result:
-                        if len(args) == 0:
-                            future.set_result(None)
-                        elif len(args) == 1:
-                            future.set_result(args[0])
-                        else:
-                            future.set_result(args)
-                        removed.append(i)
-
-            if len(removed) == len(listeners):
-                self._listeners.pop(event_name)
-            else:
-                for idx in reversed(removed):
-                    del listeners[idx]
+            self._was_ready = True
+            self.dispatch('ready')
 
-        try:
-            coro = getattr(self, method)
-        except AttributeError:
-            pass
-        else:
-            self._schedule_event(coro, method, *args, **kwargs)
+    def _is_fatal(self, exc: BaseException) -> bool:
+        if isinstance(exc, ConnectionClosed):
+            return exc.code in RevoltWebSocket.FATAL_CLOSE_CODES
+
+        if isinstance(exc, aiohttp.WSServerHandshakeError):
+            # Bad credentials won't get better by retrying
+            return exc.status in (401, 403)
+
+        return False
+
+    async def connect(self, *, reconnect: bool = True) -> None:
+        """Connects to the gateway and keeps the connection alive.
+
+        Dropped connections are retried with exponential backoff and full jitter,
+        up to ``max_reconnect_attempts`` times in a row. Authentication failures
+        and, if ``reconnect`` is ``False``, any disconnect end the loop.
+        """
+
+        backoff = ExponentialBackoff(self.reconnect_base_delay, maximum=self.reconnect_max_delay)
+
+        while not self._closed:
+            connected = False
+            try:
+                # after a disconnect, pick up from the last message the previous connection saw
+                resume = self.ws._last_message_id if self.ws is not None and self._was_ready else None
+                self.ws = await asyncio.wait_for(RevoltWebSocket.build(self, loop=self.loop, resume=resume), timeout=60)
+                connected = True
+                self.dispatch('connect')
+
+                while True:
+                    await self.ws.poll_event()
+                    # applies backpressure to the gateway when handlers fall behind
+                    await self._scheduler.wait_for_capacity()
+            except (OSError, asyncio.TimeoutError, aiohttp.ClientError, ConnectionClosed) as exc:
+                self._ready.clear()
+
+                if connected and self.ws is not None:
+                    # stops the old heartbeat and releases the socket before a new one is made
+                    try:
+                        await self.ws.close(code=1000)
+                    except Exception:
+                        pass
+
+                if connected:
+                    self.dispatch('disconnect')
+
+                    if self.ws is not None and self.ws.authenticated:
+                        # The connection worked; start the backoff over
+                        backoff.reset()
+
+                if self._closed:
+                    return
+
+                if self._is_fatal(exc) or not reconnect:
+                    await self.close()
+                    raise
+
+                if self.max_reconnect_attempts is not None and backoff.attempts >= self.max_reconnect_attempts:
+                    _log.error('Giving up after %d reconnect attempts', backoff.attempts)
+                    await self.close()
+                    raise
+
+                delay = backoff.delay()
+                _log.warning('Gateway connection lost (%s), reconnecting in %.2fs', exc, delay)
+                await asyncio.sleep(delay)
+
+    def dispatch(self, event_name: str, *args: Any, **kwargs: Any) -> None:
+        _log.debug('Dispatching event %s', event_name)
+
+        self._waiters.dispatch(event_name, args)
+
+        for handler in self._handlers.get(event_name, ()):
+            self._schedule_event(handler, event_name, *args, **kwargs)
 
     async def close(self) -> None:
         if self._closed:
             return
 
-        await self.http.close()
         self._closed = True
 
-        try:
-            await self.ws.close(code=1000)
-        except Exception:
-            pass
+        if self.ws is not None:
+            try:
+                await self.ws.close(code=1000)
+            except Exception:
+                pass
+
+        if self.state.typing is not None:
+            self.state.typing.clear()
+        if self.state.reactions is not None:
+            self.state.reactions.clear()
 
+        await self._scheduler.close()
+        await self.http.close()
         self._ready.clear()
 
+    async def __aenter__(self) -> Client:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
     def run(self, token: str, *, reconnect=True) -> None:
         async def runner():
             async with self:
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Callable, Coroutine, Literal, Optional
+
+from .waiters import _extract_key
+
+__all__ = ("EventScheduler",)
+
+_log = logging.getLogger(__name__)
+
+OverflowPolicy = Literal["block", "drop_oldest", "drop_newest"]
+
+
+class _Job:
+    __slots__ = ("func", "event", "args", "kwargs", "channel")
+
+    def __init__(
+        self,
+        func: Callable[..., Coroutine[Any, Any, Any]],
+        event: str,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        channel: Optional[str]
+    ) -> None:
+        self.func = func
+        self.event = event
+        self.args = args
+        self.kwargs = kwargs
+        self.channel = channel
+
+
+class EventScheduler:
+    """Runs event handlers on a fixed pool of worker tasks.
+
+    Handlers are queued rather than each getting their own task. At most
+    ``max_pending`` handlers wait in the queue; past that ``overflow`` decides
+    what happens: ``"block"`` makes :meth:`wait_for_capacity` hold up the
+    gateway reader, ``"drop_oldest"`` and ``"drop_newest"`` discard a handler.
+
+    Handlers for events about the same channel run one after another in the
+    order they were dispatched. ``limits`` caps how many handlers of a given
+    event (e.g. ``{"message": 4}``) run at once; handlers over the cap are set
+    aside without occupying a worker, so other events keep flowing.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[..., Coroutine[Any, Any, None]],
+        *,
+        workers: int = 32,
+        max_pending: int = 10000,
+        overflow: OverflowPolicy = "block",
+        limits: Optional[dict[str, int]] = None
+    ) -> None:
+        if overflow not in ("block", "drop_oldest", "drop_newest"):
+            raise ValueError(f"Unknown overflow policy {overflow!r}")
+
+        self.runner = runner
+        self.workers: int = max(1, workers)
+        self.max_pending: int = max_pending
+        self.overflow: OverflowPolicy = overflow
+        self.dropped: int = 0
+
+        self._limits: dict[str, int] = {event: max(1, limit) for event, limit in (limits or {}).items()}
+        # event -> number of its handlers running, for events with a limit
+        self._running: dict[str, int] = {}
+        # event -> handlers waiting for one of the event's slots to free up
+        self._throttled: dict[str, deque[_Job]] = {}
+        # throttled handlers that were handed a freed slot, taken before the queue
+        self._resumed: deque[_Job] = deque()
+
+        self._queue: deque[_Job] = deque()
+        # channel id -> handlers waiting for the one currently running for that channel
+        self._busy: dict[str, deque[_Job]] = {}
+        # queued plus parked handlers, i.e. everything not yet running
+        self._pending: int = 0
+
+        self._not_empty: asyncio.Event = asyncio.Event()
+        self._has_capacity: asyncio.Event = asyncio.Event()
+        self._has_capacity.set()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def full(self) -> bool:
+        return self._pending >= self.max_pending
+
+    def submit(self, func: Callable[..., Coroutine[Any, Any, Any]], event: str, *args: Any, **kwargs: Any) -> None:
+        if not self._tasks:
+            self._start()
+
+        if self._pending >= self.max_pending:
+            if self.overflow == "drop_newest" or (self.overflow == "drop_oldest" and not self._queue):
+                self.dropped += 1
+                _log.warning("Event queue full, dropping %s", event)
+                return
+
+            if self.overflow == "drop_oldest":
+                dropped = self._queue.popleft()
+                self._pending -= 1
+                self.dropped += 1
+                _log.warning("Event queue full, dropping %s", dropped.event)
+
+        self._queue.append(_Job(func, event, args, kwargs, _extract_key("channel", args)))
+        self._pending += 1
+        self._not_empty.set()
+
+        if self._pending >= self.max_pending:
+            self._has_capacity.clear()
+
+    async def wait_for_capacity(self) -> None:
+        """Waits until the queue has room again. Only blocks under the ``"block"`` policy."""
+
+        if self.overflow == "block" and not self._has_capacity.is_set():
+            await self._has_capacity.wait()
+
+    def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._worker(), name=f"nextvolt: dispatch worker {i}") for i in range(self.workers)
+        ]
+
+    async def close(self, *, timeout: Optional[float] = 5.0) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+
+        if tasks:
+            _, still_running = await asyncio.wait(tasks, timeout=timeout)
+            if still_running:
+                _log.warning("%d dispatch workers did not stop within %s seconds", len(still_running), timeout)
+
+        self._queue.clear()
+        self._busy.clear()
+        self._running.clear()
+        self._throttled.clear()
+        self._resumed.clear()
+        self._pending = 0
+        self._has_capacity.set()
+
+    def _took(self) -> None:
+        self._pending -= 1
+        if self._pending < self.max_pending:
+            self._has_capacity.set()
+
+    def _admit(self, job: _Job) -> bool:
+        # Takes one of the event's slots, or sets the job aside until one frees
+        # up. A set aside job keeps its channel busy so its order is kept.
+        limit = self._limits.get(job.event)
+        if limit is None:
+            return True
+
+        running = self._running.get(job.event, 0)
+        if running >= limit:
+            self._throttled.setdefault(job.event, deque()).append(job)
+            return False
+
+        self._running[job.event] = running + 1
+        return True
+
+    def _release(self, job: _Job) -> None:
+        if job.event not in self._running:
+            return
+
+        throttled = self._throttled.get(job.event)
+        if throttled:
+            # the slot passes straight to the longest waiting handler
+            self._resumed.append(throttled.popleft())
+            self._not_empty.set()
+        else:
+            self._running[job.event] -= 1
+
+    async def _next_job(self) -> _Job:
+        while True:
+            while not self._queue and not self._resumed:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+
+            if self._resumed:
+                self._took()
+                return self._resumed.popleft()
+
+            job = self._queue.popleft()
+
+            channel = job.channel
+            if channel is not None:
+                parked = self._busy.get(channel)
+                if parked is not None:
+                    # Another worker is running a handler for this channel and
+                    # will pick this one up when it's done.
+                    parked.append(job)
+                    continue
+
+                self._busy[channel] = deque()
+
+            if self._admit(job):
+                self._took()
+                return job
+
+    def _next_for_channel(self, channel: Optional[str]) -> Optional[_Job]:
+        if channel is None:
+            return None
+
+        parked = self._busy.get(channel)
+        if not parked:
+            self._busy.pop(channel, None)
+            return None
+
+        job = parked.popleft()
+        if not self._admit(job):
+            return None
+
+        self._took()
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job: Optional[_Job] = await self._next_job()
+
+            while job is not None:
+                try:
+                    await self.runner(job.func, "on_" + job.event, *job.args, **job.kwargs)
+                except Exception:
+                    _log.exception("Unhandled exception while running a %s handler", job.event)
+                finally:
+                    self._release(job)
+                    job = self._next_for_channel(job.channel)
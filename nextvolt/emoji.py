@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from .server import Server
+    from .state import ConnectionState
+    from .types.emoji import Emoji as EmojiPayload
+
+__all__ = ("Emoji",)
+
+
+class Emoji:
+    """A custom emoji. ``server_id`` is ``None`` once the emoji is detached from its server."""
+
+    __slots__ = ("_state", "id", "name", "server_id", "creator_id", "animated", "nsfw")
+
+    def __init__(self, state: ConnectionState, data: EmojiPayload) -> None:
+        self._state: ConnectionState = state
+
+        self.id: str = sys.intern(data["_id"])
+        self.name: str = data["name"]
+        parent = data["parent"]
+        self.server_id: Optional[str] = sys.intern(parent["id"]) if parent["type"] == "Server" else None
+        self.creator_id: str = sys.intern(data["creator_id"])
+        self.animated: bool = data.get("animated", False)
+        self.nsfw: bool = data.get("nsfw", False)
+
+    def __repr__(self) -> str:
+        return f"<Emoji id={self.id!r} name={self.name!r}>"
+
+    def __str__(self) -> str:
+        return f":{self.id}:"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Emoji) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    @property
+    def server(self) -> Optional[Server]:
+        return self._state.get_server(self.server_id) if self.server_id is not None else None
+
+    @property
+    def url(self) -> str:
+        return f"{self._state.http._autumn_url()}/emojis/{self.id}"
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from enum import Enum
+
+__all__ = ("SortType",)
+
+
+class SortType(Enum):
+    """The order messages are returned in when fetching or searching."""
+
+    relevance = "Relevance"
+    latest = "Latest"
+    oldest = "Oldest"
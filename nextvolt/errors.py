@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from aiohttp import ClientResponse
@@ -18,6 +18,7 @@ __all__ = (
     "RevoltServerError",
     "InvalidData",
     "InvalidArgument",
+    "ConnectionClosed",
 )
 
 
@@ -83,3 +84,11 @@ class InvalidData(HTTPException):
 
 class InvalidArgument(HTTPException):
     pass
+
+
+class ConnectionClosed(ClientException):
+    def __init__(self, code: Optional[int] = None, reason: str = ''):
+        self.code: Optional[int] = code
+        self.reason: str = reason
+
+        super().__init__(f"WebSocket closed with code {code}" + (f": {reason}" if reason else ""))
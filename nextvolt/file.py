@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import os
+from typing import IO, Any, AsyncIterable, AsyncIterator, Callable, Optional, Union
+
+__all__ = ("File",)
+
+FileSource = Union[str, "os.PathLike[str]", bytes, bytearray, memoryview, IO[bytes], AsyncIterable[bytes]]
+ProgressCallback = Callable[[int, Optional[int]], Any]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class File:
+    """Represents a file that can be uploaded to Autumn.
+
+    The source can be a path, an open binary file object, a bytes-like object or an
+    async iterator of byte chunks. Uploads stream the source in ``chunk_size`` pieces
+    so the whole file never has to be held in memory.
+    """
+
+    __slots__ = ("source", "filename", "spoiler", "chunk_size")
+
+    def __init__(
+        self,
+        source: FileSource,
+        *,
+        filename: Optional[str] = None,
+        spoiler: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> None:
+        self.source: FileSource = source
+        self.spoiler: bool = spoiler
+        self.chunk_size: int = chunk_size
+
+        if filename is None:
+            if isinstance(source, (str, os.PathLike)):
+                filename = os.path.basename(os.fspath(source))
+            else:
+                name = getattr(source, "name", None)
+                filename = os.path.basename(name) if isinstance(name, str) else "file"
+
+        if spoiler and not filename.startswith("SPOILER_"):
+            filename = f"SPOILER_{filename}"
+
+        self.filename: str = filename
+
+    def __repr__(self) -> str:
+        return f"<File filename={self.filename!r} spoiler={self.spoiler}>"
+
+    @property
+    def size(self) -> Optional[int]:
+        """The size of the file in bytes, if it can be known without reading it."""
+
+        source = self.source
+
+        if isinstance(source, (str, os.PathLike)):
+            return os.stat(source).st_size
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return memoryview(source).nbytes
+
+        if isinstance(source, io.IOBase) and source.seekable():
+            position = source.tell()
+            end = source.seek(0, io.SEEK_END)
+            source.seek(position)
+            return end - position
+
+        return None
+
+    async def read(self) -> bytes:
+        """Reads the whole file into memory."""
+
+        return b"".join([bytes(chunk) async for chunk in self.iter_chunks()])
+
+    async def iter_chunks(self, *, progress: Optional[ProgressCallback] = None) -> AsyncIterator[Union[bytes, memoryview]]:
+        """Yields the contents of the file in chunks.
+
+        ``progress`` is called after each chunk with the number of bytes sent so far
+        and the total size, or ``None`` if the size isn't known.
+        """
+
+        total = self.size if progress is not None else None
+        sent = 0
+
+        async for chunk in self._iter_source():
+            sent += len(chunk)
+            if progress is not None:
+                progress(sent, total)
+            yield chunk
+
+    async def _iter_source(self) -> AsyncIterator[Union[bytes, memoryview]]:
+        source = self.source
+        chunk_size = self.chunk_size
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            view = memoryview(source).cast("B")
+            for offset in range(0, len(view), chunk_size):
+                yield view[offset:offset + chunk_size]
+
+        elif isinstance(source, (str, os.PathLike)):
+            loop = asyncio.get_running_loop()
+            fp = await loop.run_in_executor(None, open, source, "rb")
+            try:
+                while chunk := await loop.run_in_executor(None, fp.read, chunk_size):
+                    yield chunk
+            finally:
+                fp.close()
+
+        elif isinstance(source, io.BytesIO):
+            while chunk := source.read(chunk_size):
+                yield chunk
+
+        elif hasattr(source, "read"):
+            loop = asyncio.get_running_loop()
+            while chunk := await loop.run_in_executor(None, source.read, chunk_size):
+                yield chunk
+
+        elif hasattr(source, "__aiter__"):
+            async for chunk in source:
+                yield chunk
+
+        else:
+            raise TypeError(f"Unsupported file source: {type(source).__name__}")
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+__all__ = ("Intents",)
+
+
+class Intents:
+    """Categories of gateway events the client wants.
+
+    Everything is enabled by default. Turning off ``typing`` or ``reactions``
+    drops those events before they're decoded; turning off ``presence`` ignores
+    user updates that only change a user's online state or status. Note that
+    cached messages then won't track their reactions, and cached users their
+    presence.
+    """
+
+    __slots__ = ("typing", "reactions", "presence")
+
+    # category -> the gateway event types that make it up
+    EVENTS: dict[str, frozenset[str]] = {
+        "typing": frozenset({"ChannelStartTyping", "ChannelStopTyping"}),
+        "reactions": frozenset({"MessageReact", "MessageUnreact", "MessageRemoveReaction"}),
+    }
+
+    def __init__(self, *, typing: bool = True, reactions: bool = True, presence: bool = True) -> None:
+        self.typing: bool = typing
+        self.reactions: bool = reactions
+        self.presence: bool = presence
+
+    def __repr__(self) -> str:
+        return f"<Intents typing={self.typing} reactions={self.reactions} presence={self.presence}>"
+
+    @classmethod
+    def all(cls) -> Intents:
+        return cls()
+
+    @classmethod
+    def none(cls) -> Intents:
+        return cls(typing=False, reactions=False, presence=False)
+
+    @property
+    def disabled_events(self) -> frozenset[str]:
+        """The gateway event types excluded by these intents."""
+        return frozenset().union(*(events for name, events in self.EVENTS.items() if not getattr(self, name)))
@@ -1,18 +1,263 @@
+from __future__ import annotations
+
 import aiohttp
 import asyncio
-import json
 import logging
+import statistics
+import time
+from collections import deque
 
-from .errors import RevoltException, HTTPException
+from . import utils
+from .errors import ConnectionClosed, RevoltException, HTTPException
 
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Collection, Iterable, Literal, Optional, Union
 
 if TYPE_CHECKING:
     from .types import gateway as gw
     from .client import Client
+    from .state import ConnectionState
+
+__all__ = ("Heartbeat", "WebSocketEventParsers", "RevoltWebSocket")
 
 _log = logging.getLogger(__name__)
 
+Parser = Callable[[Any], Optional[Awaitable[None]]]
+
+_JSON_TYPE_PREFIX = '{"type":"'
+_MSGPACK_TYPE_KEY = b"\xa4type"
+
+
+def _peek_type(data: Union[str, bytes]) -> Optional[str]:
+    """Reads the ``type`` of a raw gateway frame without decoding it.
+
+    Revolt always serialises ``type`` first. Returns ``None`` if the frame
+    doesn't start the expected way, in which case it must be decoded normally.
+    """
+
+    if isinstance(data, str):
+        if not data.startswith(_JSON_TYPE_PREFIX):
+            return None
+
+        end = data.find('"', len(_JSON_TYPE_PREFIX))
+        return data[len(_JSON_TYPE_PREFIX):end] if end != -1 else None
+
+    # msgpack: a map header, the fixstr "type", then the value as a str
+    if not data:
+        return None
+
+    header = data[0]
+    if 0x80 <= header <= 0x8f:
+        index = 1
+    elif header == 0xde:
+        index = 3
+    elif header == 0xdf:
+        index = 5
+    else:
+        return None
+
+    if data[index:index + 5] != _MSGPACK_TYPE_KEY:
+        return None
+
+    index += 5
+    if index >= len(data):
+        return None
+
+    marker = data[index]
+    if 0xa0 <= marker <= 0xbf:
+        length, start = marker & 0x1f, index + 1
+    elif marker == 0xd9 and index + 1 < len(data):
+        length, start = data[index + 1], index + 2
+    else:
+        return None
+
+    try:
+        return data[start:start + length].decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+class WebSocketEventParsers:
+    """The gateway event types the client handles, and the handler for each.
+
+    Lookups are a single dict access. Disabled event types are dropped by the
+    gateway as soon as their ``type`` is read, before the rest of the frame is
+    decoded, so events nobody listens to cost next to nothing.
+    """
+
+    # needed to fill the cache or to keep the connection itself working; can't be turned off
+    REQUIRED = frozenset({"Ready", "Authenticated", "Error", "Pong", "Bulk"})
+
+    __slots__ = ("_all", "_enabled", "_disabled")
+
+    def __init__(self, state: ConnectionState) -> None:
+        self._all: dict[str, Parser] = dict(state.parsers)
+        self._enabled: dict[str, Parser] = dict(self._all)
+        self._disabled: set[str] = set()
+
+    def __contains__(self, event: str) -> bool:
+        return event in self._enabled
+
+    def __iter__(self):
+        return iter(self._enabled)
+
+    def get(self, event: Optional[str]) -> Optional[Parser]:
+        return self._enabled.get(event)  # type: ignore
+
+    @property
+    def disabled(self) -> frozenset[str]:
+        return frozenset(self._disabled)
+
+    def is_disabled(self, event: Optional[str]) -> bool:
+        return event in self._disabled
+
+    def register(self, event: str, parser: Parser) -> None:
+        """Handles ``event`` with ``parser``, replacing any existing handler."""
+
+        self._all[event] = parser
+        if event not in self._disabled:
+            self._enabled[event] = parser
+
+    def disable(self, *events: str) -> None:
+        for event in events:
+            if event in self.REQUIRED:
+                raise ValueError(f"The {event} event can't be disabled")
+
+            self._disabled.add(event)
+            self._enabled.pop(event, None)
+
+    def enable(self, *events: str) -> None:
+        for event in events:
+            self._disabled.discard(event)
+            parser = self._all.get(event)
+            if parser is not None:
+                self._enabled[event] = parser
+
+
+class Heartbeat:
+    """Keeps a gateway connection alive and measures its latency.
+
+    Sends a Revolt ``Ping`` every ``interval`` seconds and matches the ``Pong``
+    replies to record round-trip times in a rolling window. If nothing has been
+    acknowledged for ``timeout`` seconds the connection is considered zombied and
+    is closed so that the client reconnects.
+    """
+
+    ZOMBIE_CLOSE_CODE = 4000
+
+    def __init__(
+        self,
+        ws: RevoltWebSocket,
+        *,
+        interval: float = 15.0,
+        timeout: Optional[float] = None,
+        window: int = 20
+    ) -> None:
+        self.ws = ws
+        self.interval = interval
+        self.timeout = timeout if timeout is not None else interval * 2
+        self.latencies: deque[float] = deque(maxlen=window)
+
+        self._sequence: int = 0
+        self._pending: dict[int, float] = {}
+        self._last_ack: float = time.perf_counter()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        self._last_ack = time.perf_counter()
+        self._task = self.ws.loop.create_task(self.run())
+
+    def stop(self) -> None:
+        task = self._task
+        self._task = None
+
+        # The heartbeat closes the socket itself on a zombie connection, in which
+        # case it must not cancel the task it is running in.
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+        self._pending.clear()
+
+    async def run(self) -> None:
+        try:
+            await self._beat()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Without a heartbeat a dead connection would go unnoticed, so hand
+            # it back to the client's reconnect loop.
+            _log.exception("Heartbeat failed, closing the connection")
+            self._pending.clear()
+            try:
+                await self.ws.close(code=self.ZOMBIE_CLOSE_CODE)
+            except Exception:
+                pass
+
+    async def _beat(self) -> None:
+        while True:
+            now = time.perf_counter()
+            if now - self._last_ack > self.timeout:
+                _log.warning("No heartbeat acknowledged for %.1fs, closing zombie connection", now - self._last_ack)
+                self._pending.clear()
+                self.ws.client.dispatch("heartbeat_timeout")
+                await self.ws.close(code=self.ZOMBIE_CLOSE_CODE)
+                return
+
+            # pings unanswered for longer than the timeout are never coming back
+            for sequence in [seq for seq, sent in self._pending.items() if now - sent > self.timeout]:
+                del self._pending[sequence]
+
+            self._sequence += 1
+            self._pending[self._sequence] = now
+
+            _log.debug("Sending heartbeat %s", self._sequence)
+            try:
+                await self.ws.send({"type": "Ping", "data": self._sequence})
+            except ConnectionError:
+                _log.debug("Could not send heartbeat, the socket is closing")
+                self._pending.clear()
+                return
+
+            await asyncio.sleep(self.interval)
+
+    def record_pong(self, data: Optional[int] = None) -> None:
+        """Acknowledges a heartbeat. ``data`` is the value echoed back in the ``Pong``."""
+
+        now = time.perf_counter()
+        self._last_ack = now
+
+        sent = self._pending.pop(data, None) if data is not None else None
+        if sent is None:
+            # A websocket-level pong or a stale reply, which still proves liveness
+            return
+
+        # Anything older than the matched ping is never coming back
+        for sequence in [seq for seq in self._pending if seq < data]:
+            del self._pending[sequence]
+
+        self.latencies.append(now - sent)
+
+    @property
+    def latency(self) -> float:
+        """The most recent heartbeat round-trip time, in seconds."""
+        return self.latencies[-1] if self.latencies else float('inf')
+
+    @property
+    def min_latency(self) -> float:
+        return min(self.latencies) if self.latencies else float('inf')
+
+    @property
+    def avg_latency(self) -> float:
+        return statistics.fmean(self.latencies) if self.latencies else float('inf')
+
+    @property
+    def p95_latency(self) -> float:
+        if not self.latencies:
+            return float('inf')
+
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
 class RevoltWebSocket:
     MISSABLE = 0
     WELCOME = 1
@@ -20,35 +265,71 @@ class RevoltWebSocket:
     INVALID_CURSOR = 8
     INTERNAL_ERROR = 9
 
+    # close codes
+    AUTHENTICATION_FAILED = 4001
+    # close codes after which reconnecting can't help: protocol errors,
+    # unsupported or invalid data, and rejected credentials
+    FATAL_CLOSE_CODES = frozenset({1002, 1003, 1007, AUTHENTICATION_FAILED})
+    # gateway errors that mean our credentials are unusable
+    AUTHENTICATION_ERRORS = frozenset({"InvalidSession", "NotAuthenticated", "OnboardingNotFinished"})
+    # frames at least this big (in bytes) are decoded in a worker thread, e.g. Ready
+    LARGE_FRAME_SIZE = 1 << 20
+
     def __init__(
         self,
         socket: aiohttp.ClientWebSocketResponse,
         client: Client,
         *,
-        loop: asyncio.AbstractEventLoop
+        loop: asyncio.AbstractEventLoop,
+        encoding: Literal["json", "msgpack"] = "json",
+        resume: Optional[str] = None
     ):
         self.client = client
         self.loop = loop
-        self._heartbeater = None
+        self.encoding = encoding
+        self._heartbeater: Optional[Heartbeat] = None
 
         # socket
         self.socket: aiohttp.ClientWebSocketResponse = socket
         self._close_code: Optional[int] = None
         
         # ws
-        self._last_message_id: Optional[str] = None
+        # the id of the newest message seen, where a later connection resumes from;
+        # None until a message arrives, in which case a reconnect does a full resync
+        self._last_message_id: Optional[str] = resume
+        self._resume_cursor: Optional[str] = resume
+        self.authenticated: bool = False
+        self._parsers: WebSocketEventParsers = client.parsers
+        # an async parser (Ready) still running; events received meanwhile wait in _buffer
+        self._ingesting: Optional[asyncio.Task[None]] = None
+        self._buffer: deque[dict[str, Any]] = deque()
     
     @property
-    def latency(self):
+    def latency(self) -> float:
         return float('inf') if self._heartbeater is None else self._heartbeater.latency
+
+    @property
+    def heartbeat(self) -> Optional[Heartbeat]:
+        return self._heartbeater
     
     async def poll_event(self) -> Optional[int]:
         msg = await self.socket.receive()
-        if msg.type is aiohttp.WSMsgType.TEXT:
+        if msg.type is aiohttp.WSMsgType.TEXT or msg.type is aiohttp.WSMsgType.BINARY:
+            event = _peek_type(msg.data)
+            if event is not None and self._parsers.is_disabled(event):
+                return None
+
             try:
-                data = json.loads(msg.data)
+                decode = utils._from_msgpack if msg.type is aiohttp.WSMsgType.BINARY else utils._from_json
+                if len(msg.data) >= self.LARGE_FRAME_SIZE:
+                    # keeps heartbeats and handlers running while a huge payload is decoded
+                    data = await self.loop.run_in_executor(None, decode, msg.data)
+                else:
+                    data = decode(msg.data)
                 op = await self.received_event(data)
-            except G as e:
+            except ConnectionClosed:
+                raise
+            except Exception as e:
                 _log.error(f"Error receiving WebSocket message: {e}")
                 self.client.dispatch('error', e)
             else:
@@ -57,41 +338,159 @@ class RevoltWebSocket:
             if self._heartbeater:
                 self._heartbeater.record_pong()
         
-        elif msg.type is aiohttp.WSMsgType.ERROR:   
-            raise Exception(f"WebSocket error: {msg.data}")
+        elif msg.type is aiohttp.WSMsgType.ERROR:
+            if self._heartbeater:
+                self._heartbeater.stop()
+                self._heartbeater = None
+
+            self._cancel_ingestion()
+            raise ConnectionClosed(self.socket.close_code, str(msg.data)) from msg.data
         
         elif msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.CLOSING):
-            return "WebSocket is in a closed or closing state."
+            if self._heartbeater:
+                self._heartbeater.stop()
+                self._heartbeater = None
+
+            self._cancel_ingestion()
+
+            code = self._close_code or self.socket.close_code
+            raise ConnectionClosed(code, msg.extra or '')
     
+    async def received_event(self, data: dict) -> Optional[int]:
+        event = data.get("type")
+
+        if event == "Pong":
+            if self._heartbeater:
+                self._heartbeater.record_pong(data.get("data"))
+            return None
+
+        if self._parsers.is_disabled(event):
+            # only reached for events inside a Bulk frame or frames _peek_type couldn't read
+            return None
+
+        if event == "Authenticated":
+            _log.info('Authenticated with the gateway')
+            self.authenticated = True
+
+        elif event == "Error":
+            error = data.get("error")
+            _log.error('Gateway reported an error: %s', error)
+
+            if error in self.AUTHENTICATION_ERRORS:
+                await self.close(code=self.AUTHENTICATION_FAILED)
+                raise ConnectionClosed(self.AUTHENTICATION_FAILED, error)
+
+            return self.INTERNAL_ERROR
+
+        elif event == "Bulk":
+            for item in data.get("v", ()):
+                await self.received_event(item)
+            return None
+
+        self.client.dispatch('socket_raw_receive', data)
+
+        if event == "Message":
+            self._last_message_id = data.get("_id", self._last_message_id)
+
+        if self._ingesting is not None:
+            # applied in order once the cache has been filled
+            self._buffer.append(data)
+            return None
+
+        self._parse(data)
+        return None
+
+    def _parse(self, data: dict[str, Any]) -> None:
+        event = data.get("type")
+        func = self._parsers.get(event)
+        if func is None:
+            if not self._parsers.is_disabled(event):
+                _log.debug('Unhandled gateway event %s', event)
+            return
+
+        if event == "Ready" and self._resume_cursor is not None:
+            result = self.client.state.resume_ready(data, self._resume_cursor)
+        else:
+            result = func(data)
+
+        if result is not None:
+            # async parsers work through their payload in chunks; keep reading
+            # frames (and pongs) meanwhile so the connection stays healthy
+            self._ingesting = self.loop.create_task(self._ingest(event, result))
+
+    async def _ingest(self, event: Optional[str], coro: Awaitable[Any]) -> None:
+        # a resume returns the ids of the messages it replayed, some of which
+        # may also have arrived live while it was fetching them
+        replayed: Collection[str] = ()
+        try:
+            result = await coro
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            _log.exception('Error while handling %s', event)
+            self.client.dispatch('error', exc)
+        else:
+            if isinstance(result, (set, frozenset)):
+                replayed = result
+
+        self._ingesting = None
+        while self._buffer and self._ingesting is None:
+            data = self._buffer.popleft()
+            if replayed and data.get("type") == "Message" and data.get("_id") in replayed:
+                continue
+
+            try:
+                self._parse(data)
+            except Exception as exc:
+                _log.error('Error handling buffered %s event: %s', data.get("type"), exc)
+                self.client.dispatch('error', exc)
+
+    def _cancel_ingestion(self) -> None:
+        if self._ingesting is not None and self._ingesting is not asyncio.current_task():
+            self._ingesting.cancel()
+        self._ingesting = None
+        self._buffer.clear()
+
     async def send(self, payload: dict) -> None:
-        payload = json.dumps(payload)
-        self.client.dispatch('socket_raw_send', payload)
-        await self.socket.send_str(payload)
+        if self.encoding == "msgpack":
+            data = utils._to_msgpack(payload)
+            self.client.dispatch('socket_raw_send', data)
+            await self.socket.send_bytes(data)
+        else:
+            data = utils._to_json(payload)
+            self.client.dispatch('socket_raw_send', data)
+            await self.socket.send_str(data)
 
     async def ping(self) -> None:
         _log.debug('Sending heartbeat')
         await self.socket.ping()
 
     async def close(self, code: int = 1000) -> None:
-        log.debug('Closing websocket connection with code %s', code)
+        _log.debug('Closing websocket connection with code %s', code)
         if self._heartbeater:
             self._heartbeater.stop()
             self._heartbeater = None
 
+        self._cancel_ingestion()
         self._close_code = code
         await self.socket.close(code=code)
     
     @classmethod
-    async def build(cls, client, *, loop: asyncio.AbstractEventLoop = None) -> "WebSocketClient":
-        try:
-            socket = await client.http.ws_connect()  
-        except aiohttp.client_exceptions.WSServerHandshakeError as exc:
-            _log.error('Failed to connect to the gateway: %s', exc)
-            return exc
-        else:
-            _log.info('Connected to the gateway')
-        ws = cls(socket, client, loop=loop or asyncio.get_event_loop())
-        ws._parsers = ws._parsers = WebSocketEventParsers(client)
-        await ws.ping()
+    async def build(
+        cls,
+        client: Client,
+        *,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        resume: Optional[str] = None
+    ) -> RevoltWebSocket:
+        """Connects to the gateway. ``resume`` is the last message id seen on a previous connection."""
+
+        encoding = client.gateway_format
+        socket = await client.http.ws_connect(format=encoding)
+        _log.info('Connected to the gateway%s', f', resuming from {resume}' if resume else '')
+
+        ws = cls(socket, client, loop=loop or asyncio.get_running_loop(), encoding=encoding, resume=resume)
+        ws._heartbeater = Heartbeat(ws, interval=client.heartbeat_interval, timeout=client.heartbeat_timeout)
+        ws._heartbeater.start()
 
         return ws
\ No newline at end of file
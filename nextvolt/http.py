@@ -1,20 +1,27 @@
 from __future__ import annotations
 import asyncio
+import functools
+import io
+import logging
+import os
 import aiohttp
 import ulid
-import json as _json
-from typing import (TYPE_CHECKING, Any, Coroutine, Literal, Optional, TypeVar,
+from typing import (IO, TYPE_CHECKING, Any, AsyncIterator, Callable, ClassVar, Coroutine, Literal, Optional, TypeVar,
                     Union, overload)
+from urllib.parse import quote
 
-from .errors import HTTPException, Forbidden, NotFound, RevoltServerError, ServerError
+from .errors import ClientException, HTTPException, Forbidden, NotFound, RevoltServerError, TooManyRequests
+from .file import DEFAULT_CHUNK_SIZE, File
+from . import utils
 
 if TYPE_CHECKING:
     import aiohttp
 
     from .enums import SortType
-    from .file import File
+    from .file import FileSource, ProgressCallback
     from .types import Autumn as AutumnPayload
     from .types import Emoji as EmojiPayload
+    from .types.file import FilePayload
     from .types import Interactions as InteractionsPayload
     from .types import Masquerade as MasqueradePayload
     from .types import Member as MemberPayload
@@ -28,20 +35,264 @@ if TYPE_CHECKING:
 T = TypeVar("T")
 Request = Coroutine[Any, Any, T]
 
-class HTTPClient:
-    __slots__ = ("session", "token", "api_url", "api_info", "auth_header")
+USER_AGENT = "NextVolt (https://github.com/sparkles-devs/NextVolt)"
+
+_log = logging.getLogger(__name__)
+
+
+class Ratelimit:
+    """Tracks the state of a single Revolt rate-limit bucket.
+
+    Requests acquire the bucket before they are sent. Acquisition is serialized
+    through a FIFO lock so that once the bucket is exhausted, waiters queue up
+    behind the reset instead of racing into a 429.
+
+    The bucket is only refilled from a response's headers. While it is unknown,
+    i.e. new or past its reset, a single request goes out to learn its state
+    and everything else waits for that response.
+    """
+
+    __slots__ = ("limit", "remaining", "reset_at", "_lock", "_probing", "_settled")
+
+    def __init__(self) -> None:
+        self.limit: int = 1
+        self.remaining: int = 0
+        self.reset_at: float = 0.0
+        self._lock: asyncio.Lock = asyncio.Lock()
+        # whether a request is out to learn the bucket's state
+        self._probing: bool = False
+        self._settled: asyncio.Event = asyncio.Event()
+        self._settled.set()
+
+    def __repr__(self) -> str:
+        return f"<Ratelimit limit={self.limit} remaining={self.remaining} reset_at={self.reset_at}>"
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+
+            while True:
+                await self._settled.wait()
+                now = loop.time()
+
+                if self.reset_at <= now:
+                    # nothing known about the current window; this request finds out
+                    self._probing = True
+                    self._settled.clear()
+                    return
+
+                if self.remaining > 0:
+                    self.remaining -= 1
+                    return
+
+                delay = self.reset_at - now
+                _log.debug("Bucket exhausted, waiting %.3fs for it to reset", delay)
+                await asyncio.sleep(delay)
+
+    def settle(self) -> None:
+        """Ends a probe whose response carried no usable headers, or that failed."""
+
+        if self._probing:
+            self._probing = False
+            self._settled.set()
+
+    def update(self, resp: aiohttp.ClientResponse) -> None:
+        """Updates the bucket from the ``X-RateLimit-*`` headers of a response."""
+
+        headers = resp.headers
+        now = asyncio.get_running_loop().time()
+
+        limit = headers.get("X-RateLimit-Limit")
+        if limit is not None:
+            self.limit = int(limit)
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            self.remaining = int(remaining)
+
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if reset_after is not None:
+            # Revolt reports the reset window in milliseconds
+            self.reset_at = now + int(reset_after) / 1000
+
+        self.settle()
 
-    def __init__(self, session: aiohttp.ClientSession, token: str, api_url: str, api_info: dict[str, Any], bot: bool = True):
-        self.session: aiohttp.ClientSession = session
-        self.token: str = token
+    def exhaust(self, retry_after: float) -> None:
+        """Marks the bucket as empty for ``retry_after`` seconds."""
+
+        self.remaining = 0
+        self.reset_at = asyncio.get_running_loop().time() + retry_after
+        self.settle()
+
+
+class Route:
+    """A single Revolt API endpoint.
+
+    ``path`` is a template such as ``/channels/{channel_id}/messages`` that is
+    formatted with ``parameters`` once into :attr:`endpoint`, which the
+    :class:`HTTPClient` joins onto its own ``api_url``. The unformatted
+    template plus the major parameters (the channel or server the route acts on)
+    identify the route for rate-limit bucketing and metrics.
+    """
+
+    __slots__ = ("method", "path", "endpoint", "major")
+
+    MAJOR_PARAMETERS: ClassVar[tuple[str, ...]] = ("channel_id", "server_id")
+
+    def __init__(self, method: Literal["GET", "POST", "PUT", "DELETE", "PATCH"], path: str, **parameters: Any) -> None:
+        self.method: str = method
+        self.path: str = path
+
+        if parameters:
+            self.endpoint: str = path.format_map(
+                {k: quote(v, safe="") if isinstance(v, str) else v for k, v in parameters.items()}
+            )
+        else:
+            self.endpoint = path
+
+        major = None
+        for name in self.MAJOR_PARAMETERS:
+            if name in parameters:
+                major = parameters[name]
+                break
+        self.major: Optional[str] = major
+
+    def __repr__(self) -> str:
+        return f"<Route method={self.method} path={self.path!r} major={self.major!r}>"
+
+    @property
+    def key(self) -> str:
+        """The route's identity, e.g. ``POST /channels/{channel_id}/messages:<channel id>``."""
+        return f"{self.method} {self.path}:{self.major}"
+
+
+class HTTPClient:
+    __slots__ = (
+        "session", "api_url", "api_info", "auth_header", "max_ratelimit_retries", "upload_concurrency",
+        "loop", "connector", "_token", "_headers", "_json_headers", "_owns_session", "_owns_connector",
+        "_connector_options",
+        "_buckets", "_bucket_keys"
+    )
+
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        token: Optional[str] = None,
+        api_url: str = "https://api.revolt.chat",
+        api_info: Optional[dict[str, Any]] = None,
+        bot: bool = True,
+        *,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        dns_cache_ttl: Optional[int] = 300,
+        keepalive_timeout: float = 30.0,
+        happy_eyeballs_delay: Optional[float] = 0.25,
+        max_ratelimit_retries: int = 5,
+        upload_concurrency: int = 4
+    ):
+        self.session: Optional[aiohttp.ClientSession] = session
         self.api_url: str = api_url
-        self.api_info: dict[str, Any] = api_info
+        self.api_info: dict[str, Any] = api_info or {}
         self.auth_header: str = "x-bot-token" if bot else "x-session-token"
+        self.token = token
+        self.max_ratelimit_retries: int = max_ratelimit_retries
+        self.upload_concurrency: int = upload_concurrency
+        self.loop: Optional[asyncio.AbstractEventLoop] = loop
+
+        # Only close sessions we created ourselves
+        self._owns_session: bool = session is None
+        self.connector: Optional[aiohttp.BaseConnector] = connector
+        # a connector passed in belongs to the caller and is never closed or replaced here
+        self._owns_connector: bool = connector is None
+        self._connector_options: dict[str, Any] = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "use_dns_cache": dns_cache_ttl is not None,
+            "ttl_dns_cache": dns_cache_ttl,
+            "keepalive_timeout": keepalive_timeout,
+            "happy_eyeballs_delay": happy_eyeballs_delay,
+        }
+
+        # bucket id (X-RateLimit-Bucket) -> bucket state
+        self._buckets: dict[str, Ratelimit] = {}
+        # route key -> bucket id, learned from responses
+        self._bucket_keys: dict[str, str] = {}
+
+    @property
+    def token(self) -> Optional[str]:
+        return self._token
+
+    @token.setter
+    def token(self, value: Optional[str]) -> None:
+        # Headers are built once per token and shared by every request
+        self._token = value
+        self._headers: dict[str, str] = {"User-Agent": USER_AGENT}
+        if value is not None:
+            self._headers[self.auth_header] = value
+
+        self._json_headers: dict[str, str] = {**self._headers, "Content-Type": "application/json"}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        session = self.session
+        if session is not None and not session.closed:
+            return session
+
+        connector = self.connector
+        if connector is None or (connector.closed and self._owns_connector):
+            connector = self.connector = aiohttp.TCPConnector(**self._connector_options)
+            self._owns_connector = True
+        elif connector.closed:
+            raise ClientException("The connector passed to the HTTP client has been closed.")
+
+        # The session is shared by REST, Autumn and the gateway, so keep-alive
+        # connections and the DNS cache survive between bursts of requests.
+        session = self.session = aiohttp.ClientSession(connector=connector, connector_owner=self._owns_connector)
+        self._owns_session = True
+        return session
+
+    async def start(self) -> None:
+        """Opens the shared session and fetches the API info if it is missing."""
+
+        self._get_session()
+
+        if not self.api_info:
+            self.api_info = await self.request(Route("GET", "/"))
+
+    async def close(self) -> None:
+        """Closes the shared session and its connection pool."""
+
+        if self.session is not None and self._owns_session:
+            await self.session.close()
+
+        self.session = None
+
+    def _get_bucket(self, key: str) -> Ratelimit:
+        bucket_id = self._bucket_keys.get(key, key)
+
+        try:
+            return self._buckets[bucket_id]
+        except KeyError:
+            bucket = self._buckets[bucket_id] = Ratelimit()
+            return bucket
+
+    def _update_bucket(self, key: str, bucket: Ratelimit, resp: aiohttp.ClientResponse) -> Ratelimit:
+        bucket_id = resp.headers.get("X-RateLimit-Bucket")
+
+        if bucket_id is not None and self._bucket_keys.get(key) != bucket_id:
+            # First time we see which bucket this route belongs to; routes sharing
+            # a bucket id share one Ratelimit from here on.
+            self._bucket_keys[key] = bucket_id
+            self._buckets.pop(key, None)
+            bucket = self._buckets.setdefault(bucket_id, bucket)
+
+        bucket.update(resp)
+        return bucket
 
     async def request(
         self, 
-        method: Literal["GET", "POST", "PUT", "DELETE", "PATCH"], 
-        route: str, 
+        route: Route, 
         *, 
         json: Optional[dict[str, Any]] = None, 
         nonce: bool = True, 
@@ -49,83 +300,150 @@ class HTTPClient:
     ) -> Any:
         """Send an HTTP request to the Revolt API."""
         
-        url = f"{self.api_url}{route}"
-        headers = {
-            "User-Agent": "NextVolt (https://github.com/sparkles-devs/NextVolt)", 
-            self.auth_header: self.token
-        }
-        
-        kwargs = {"headers": headers}
+        method = route.method
+        url = self.api_url + route.endpoint
+        kwargs: dict[str, Any] = {"headers": self._headers}
 
         if json:
-            headers["Content-Type"] = "application/json"
+            kwargs["headers"] = self._json_headers
             if nonce and isinstance(json, dict) and "nonce" not in json:
                 json["nonce"] = ulid.new().str
-            kwargs["data"] = _json.dumps(json)
+            kwargs["data"] = utils._to_json_bytes(json)
 
         if params:
-            kwargs["params"] = params
-
-        async with self.session.request(method, url, **kwargs) as resp:
-            text = await resp.text()
+            # yarl rejects bools in query strings
+            kwargs["params"] = {
+                key: ("true" if value else "false") if isinstance(value, bool) else value
+                for key, value in params.items()
+            }
+
+        key = route.key
+        bucket = self._get_bucket(key)
+
+        # the first attempt plus up to max_ratelimit_retries retries after a 429
+        attempts = max(0, self.max_ratelimit_retries) + 1
+        for tries in range(attempts):
+            acquired = bucket
+            await acquired.acquire()
+
+            # a probe whose response never updates the bucket must still let the others go
             try:
-                response_data = _json.loads(text) if text else None
-            except ValueError:
-                raise HTTPException(resp, f"Invalid JSON response:\n{text}")
-
-            if 200 <= resp.status < 300:
-                return response_data  # Successful response
-            
-            # Handle known HTTP errors
-            if resp.status == 400:
-                raise HTTPException(resp, response_data or "400: Bad Request")
-            elif resp.status == 401:
-                raise Forbidden(resp, response_data or "401: Unauthorized")
-            elif resp.status == 403:
-                raise Forbidden(resp, response_data or "403: Forbidden")
-            elif resp.status == 404:
-                raise NotFound(resp, response_data or "404: Not Found")
-            elif resp.status == 429:
-                retry_after = response_data.get("retry_after", 1) if isinstance(response_data, dict) else 1
-                if isinstance(retry_after, (int, float)):
-                    await asyncio.sleep(retry_after)
-                    return await self.request(method, route, json=json, nonce=nonce, params=params)
-            elif resp.status >= 500:
-                raise RevoltServerError(resp, response_data or f"{resp.status}: Server Error")
-
-            raise HTTPException(resp, f"Unexpected error: {resp.status} {text}")
-
-    async def upload_file(self, file: File, tag: Literal["attachments", "avatars", "backgrounds", "icons", "banners", "emojis"]) -> AutumnPayload:
-        """Uploads a file to Revolt's Autumn file server."""
-        
+                async with self._get_session().request(method, url, **kwargs) as resp:
+                    bucket = self._update_bucket(key, bucket, resp)
+
+                    body = await resp.read()
+                    try:
+                        response_data = utils._from_json(body) if body else None
+                    except ValueError:
+                        raise HTTPException(resp, f"Invalid JSON response:\n{body.decode('utf-8', 'replace')}")
+
+                    if 200 <= resp.status < 300:
+                        return response_data  # Successful response
+                
+                    # Handle known HTTP errors
+                    if resp.status == 400:
+                        raise HTTPException(resp, response_data or "400: Bad Request")
+                    elif resp.status == 401:
+                        raise Forbidden(resp, response_data or "401: Unauthorized")
+                    elif resp.status == 403:
+                        raise Forbidden(resp, response_data or "403: Forbidden")
+                    elif resp.status == 404:
+                        raise NotFound(resp, response_data or "404: Not Found")
+                    elif resp.status == 429:
+                        # retry_after is in milliseconds
+                        retry_after = response_data.get("retry_after", 1000) if isinstance(response_data, dict) else 1000
+                        retry_after = retry_after / 1000 if isinstance(retry_after, (int, float)) else 1.0
+
+                        # later requests on the route wait it out either way
+                        bucket.exhaust(retry_after)
+                        if tries + 1 >= attempts:
+                            raise TooManyRequests(resp, response_data)
+
+                        _log.warning("Rate limited on %s, retrying in %.3fs (attempt %d)", key, retry_after, tries + 1)
+                        continue
+                    elif resp.status >= 500:
+                        raise RevoltServerError(resp, response_data or f"{resp.status}: Server Error")
+
+                    raise HTTPException(resp, f"Unexpected error: {resp.status} {body.decode('utf-8', 'replace')}")
+            finally:
+                acquired.settle()
+
+    def _autumn_url(self) -> str:
         autumn_url = self.api_info.get("features", {}).get("autumn", {}).get("url")
         if not autumn_url:
-            raise HTTPException(None, "Autumn file server URL is missing from API info.")
+            raise ClientException("Autumn file server URL is missing from API info.")
 
-        url = f"{autumn_url}/{tag}"
-        headers = {
-            "User-Agent": "NextVolt (https://github.com/sparkles-devs/NextVolt)",
-            self.auth_header: self.token
-        }
+        return autumn_url
+
+    async def upload_file(
+        self,
+        file: Union[File, FileSource],
+        tag: Literal["attachments", "avatars", "backgrounds", "icons", "banners", "emojis"],
+        *,
+        progress: Optional[ProgressCallback] = None
+    ) -> AutumnPayload:
+        """Uploads a file to Revolt's Autumn file server.
+
+        The file is streamed in chunks rather than read into memory. ``file`` may be a
+        :class:`File` or anything a :class:`File` can be built from.
+        """
+        
+        url = f"{self._autumn_url()}/{tag}"
+        if not isinstance(file, File):
+            file = File(file)
 
         form = aiohttp.FormData()
-        form.add_field("file", await file.read(), filename=file.filename)
+        form.add_field("file", file.iter_chunks(progress=progress), filename=file.filename)
 
-        async with self.session.post(url, data=form, headers=headers) as resp:
-            text = await resp.text()
+        async with self._get_session().post(url, data=form, headers=self._headers) as resp:
+            body = await resp.read()
             try:
-                response_data = _json.loads(text)
+                response_data = utils._from_json(body)
             except ValueError:
-                raise HTTPException(resp, f"Invalid JSON response from Autumn:\n{text}")
+                raise HTTPException(resp, f"Invalid JSON response from Autumn:\n{body.decode('utf-8', 'replace')}")
 
             if resp.status == 400:
-                raise HTTPError(response_data)
+                raise HTTPException(resp, response_data)
             elif 500 <= resp.status < 600:
-                raise ServerError(resp, response_data)
+                raise RevoltServerError(resp, response_data)
 
             return response_data
 
-    
+    async def upload_files(
+        self,
+        files: list[Union[File, FileSource]],
+        tag: Literal["attachments", "avatars", "backgrounds", "icons", "banners", "emojis"],
+        *,
+        concurrency: Optional[int] = None,
+        progress: Optional[Callable[[int, int, Optional[int]], Any]] = None
+    ) -> list[str]:
+        """Uploads several files to Autumn concurrently.
+
+        At most ``concurrency`` uploads (defaults to :attr:`upload_concurrency`) are
+        in flight at once. The returned asset ids are in the same order as ``files``.
+        ``progress``, if given, is called with the index of the file followed by the
+        bytes sent and total size of that file.
+        """
+
+        if len(files) == 1:
+            data = await self.upload_file(files[0], tag, progress=progress and functools.partial(progress, 0))
+            return [data["id"]]
+
+        semaphore = asyncio.Semaphore(concurrency or self.upload_concurrency)
+
+        async def upload(index: int, file: Union[File, FileSource]) -> str:
+            async with semaphore:
+                data = await self.upload_file(file, tag, progress=progress and functools.partial(progress, index))
+                return data["id"]
+
+        tasks = [asyncio.ensure_future(upload(index, file)) for index, file in enumerate(files)]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
     async def send_message(
         self, 
         channel: str, 
@@ -147,13 +465,7 @@ class HTTPClient:
             json["embeds"] = embeds
 
         if attachments:
-            attachment_ids: list[str] = []
-
-            for attachment in attachments:
-                data = await self.upload_file(attachment, "attachments")
-                attachment_ids.append(data["id"])
-
-            json["attachments"] = attachment_ids
+            json["attachments"] = await self.upload_files(attachments, "attachments")
 
         if replies:
             json["replies"] = replies
@@ -164,7 +476,7 @@ class HTTPClient:
         if interactions:
             json["interactions"] = interactions
 
-        return await self.request("POST", f"/channels/{channel}/messages", json=json)
+        return await self.request(Route("POST", "/channels/{channel_id}/messages", channel_id=channel), json=json)
 
     def edit_message(self, channel: str, message: str, content: Optional[str] = None, embeds: Optional[list[SendableEmbedPayload]] = None) -> Request[None]:
         """Edit a message in a channel."""
@@ -177,7 +489,7 @@ class HTTPClient:
         if embeds is not None:
             json["embeds"] = embeds
 
-        return self.request("PATCH", f"/channels/{channel}/messages/{message}", json=json)
+        return self.request(Route("PATCH", "/channels/{channel_id}/messages/{message_id}", channel_id=channel, message_id=message), json=json)
 
     @overload
     def fetch_messages(
@@ -228,7 +540,7 @@ class HTTPClient:
             }.items() if v is not None}
         }
 
-        return self.request("GET", f"/channels/{channel}/messages", params=params)
+        return self.request(Route("GET", "/channels/{channel_id}/messages", channel_id=channel), params=params)
 
     @overload
     def search_messages(
@@ -279,38 +591,162 @@ class HTTPClient:
             }.items() if v is not None}
         }
 
-        return self.request("POST", f"/channels/{channel}/search", json=json)
+        return self.request(Route("POST", "/channels/{channel_id}/search", channel_id=channel), json=json)
 
     async def request_file(self, url: str) -> bytes:
-        async with self.session.get(url) as resp:
+        async with self._get_session().get(url) as resp:
             return await resp.read()
+
+    async def stream_file(
+        self,
+        url: str,
+        *,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Yields the body of ``url`` in chunks without buffering the whole file.
+
+        ``start`` and ``end`` (inclusive) request a byte range. If the server ignores
+        the range, the bytes before ``start`` are skipped client-side.
+        """
+
+        headers = None
+        if start or end is not None:
+            headers = {"Range": f"bytes={start}-{'' if end is None else end}"}
+
+        async with self._get_session().get(url, headers=headers) as resp:
+            if resp.status == 416 and start:
+                # Nothing left past ``start``, e.g. when resuming a complete download
+                return
+
+            if resp.status >= 400:
+                text = await resp.text()
+                if resp.status == 403:
+                    raise Forbidden(resp, text or "403: Forbidden")
+                elif resp.status == 404:
+                    raise NotFound(resp, text or "404: Not Found")
+                elif resp.status >= 500:
+                    raise RevoltServerError(resp, text or f"{resp.status}: Server Error")
+
+                raise HTTPException(resp, f"Unexpected error: {resp.status} {text}")
+
+            skip = start if resp.status != 206 else 0
+            remaining = None if end is None or resp.status == 206 else end - start + 1
+
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                if skip:
+                    if len(chunk) <= skip:
+                        skip -= len(chunk)
+                        continue
+
+                    chunk = chunk[skip:]
+                    skip = 0
+
+                if remaining is not None:
+                    chunk = chunk[:remaining]
+                    remaining -= len(chunk)
+
+                yield chunk
+
+                if remaining == 0:
+                    return
+
+    async def download_file(
+        self,
+        url: str,
+        fp: Union[str, os.PathLike[str], IO[bytes]],
+        *,
+        resume: bool = False,
+        expected_size: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> int:
+        """Downloads ``url`` straight into a path or binary file object.
+
+        With ``resume``, the download continues from the current size of the path
+        (or the position of the file object) using an HTTP Range request. If
+        ``expected_size`` is given, the final size is checked against it.
+        Returns the total number of bytes in the file.
+        """
+
+        loop = asyncio.get_running_loop()
+        opened = isinstance(fp, (str, os.PathLike))
+
+        if opened:
+            fp = await loop.run_in_executor(None, open, fp, "ab" if resume else "wb")
+
+        try:
+            start = fp.tell() if resume else 0
+            written = start
+            in_memory = isinstance(fp, io.BytesIO)
+
+            async for chunk in self.stream_file(url, start=start, chunk_size=chunk_size):
+                if in_memory:
+                    fp.write(chunk)
+                else:
+                    await loop.run_in_executor(None, fp.write, chunk)
+                written += len(chunk)
+        finally:
+            if opened:
+                fp.close()
+
+        if expected_size is not None and written != expected_size:
+            raise ClientException(f"Downloaded {written} bytes from {url}, expected {expected_size}")
+
+        return written
+
+    def asset_url(self, asset: FilePayload) -> str:
+        """Returns the Autumn URL of an uploaded file."""
+        return f"{self._autumn_url()}/{asset['tag']}/{asset['_id']}"
+
+    def stream_asset(self, asset: FilePayload, *, start: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Yields the contents of an uploaded file in chunks."""
+        return self.stream_file(self.asset_url(asset), start=start, chunk_size=chunk_size)
+
+    def download_asset(
+        self,
+        asset: FilePayload,
+        fp: Union[str, os.PathLike[str], IO[bytes]],
+        *,
+        resume: bool = False,
+        verify_size: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Request[int]:
+        """Downloads an uploaded file, checking it against the payload's ``size`` by default."""
+        return self.download_file(
+            self.asset_url(asset),
+            fp,
+            resume=resume,
+            expected_size=asset.get("size") if verify_size else None,
+            chunk_size=chunk_size
+        )
     
-      def fetch_user(self, user_id: str) -> Request[UserPayload]:
-        return self.request("GET", f"/users/{user_id}")
+    def fetch_user(self, user_id: str) -> Request[UserPayload]:
+        return self.request(Route("GET", "/users/{user_id}", user_id=user_id))
 
     def fetch_profile(self, user_id: str) -> Request[UserProfile]:
-        return self.request("GET", f"/users/{user_id}/profile")
+        return self.request(Route("GET", "/users/{user_id}/profile", user_id=user_id))
 
     def fetch_default_avatar(self, user_id: str) -> Request[bytes]:
-        return self.request_file(f"{self.api_url}/users/{user_id}/default_avatar")
+        return self.request_file(self.api_url + Route("GET", "/users/{user_id}/default_avatar", user_id=user_id).endpoint)
 
     def fetch_dm_channels(self) -> Request[list[Union[DMChannel, GroupDMChannel]]]:
-        return self.request("GET", "/users/dms")
+        return self.request(Route("GET", "/users/dms"))
 
     def open_dm(self, user_id: str) -> Request[Union[DMChannel, SavedMessages]]:
-        return self.request("GET", f"/users/{user_id}/dm")
+        return self.request(Route("GET", "/users/{user_id}/dm", user_id=user_id))
 
     def fetch_channel(self, channel_id: str) -> Request[Channel]:
-        return self.request("GET", f"/channels/{channel_id}")
+        return self.request(Route("GET", "/channels/{channel_id}", channel_id=channel_id))
 
     def close_channel(self, channel_id: str) -> Request[None]:
-        return self.request("DELETE", f"/channels/{channel_id}")
+        return self.request(Route("DELETE", "/channels/{channel_id}", channel_id=channel_id))
 
     def fetch_server(self, server_id: str) -> Request[Server]:
-        return self.request("GET", f"/servers/{server_id}")
+        return self.request(Route("GET", "/servers/{server_id}", server_id=server_id))
 
     def delete_leave_server(self, server_id: str) -> Request[None]:
-        return self.request("DELETE", f"/servers/{server_id}")
+        return self.request(Route("DELETE", "/servers/{server_id}", server_id=server_id))
 
     @overload
     def create_channel(self, server_id: str, channel_type: Literal["Text"], name: str, description: Optional[str]) -> Request[TextChannel]: ...
@@ -322,47 +758,48 @@ class HTTPClient:
         self, server_id: str, channel_type: Literal["Text", "Voice"], name: str, description: Optional[str]
     ) -> Request[Union[TextChannel, VoiceChannel]]:
         payload = {"type": channel_type, "name": name, **({"description": description} if description else {})}
-        return self.request("POST", f"/servers/{server_id}/channels", json=payload)
+        return self.request(Route("POST", "/servers/{server_id}/channels", server_id=server_id), json=payload)
     
 
     def fetch_server_invites(self, server_id: str) -> Request[list[PartialInvite]]:
-        return self.request("GET", f"/servers/{server_id}/invites")
+        return self.request(Route("GET", "/servers/{server_id}/invites", server_id=server_id))
 
     def fetch_member(self, server_id: str, member_id: str) -> Request[Member]:
-        return self.request("GET", f"/servers/{server_id}/members/{member_id}")
+        return self.request(Route("GET", "/servers/{server_id}/members/{member_id}", server_id=server_id, member_id=member_id))
 
     def kick_member(self, server_id: str, member_id: str) -> Request[None]:
-        return self.request("DELETE", f"/servers/{server_id}/members/{member_id}")
+        return self.request(Route("DELETE", "/servers/{server_id}/members/{member_id}", server_id=server_id, member_id=member_id))
 
-    def fetch_members(self, server_id: str) -> Request[GetServerMembers]:
-        return self.request("GET", f"/servers/{server_id}/members")
+    def fetch_members(self, server_id: str, *, exclude_offline: bool = False) -> Request[GetServerMembers]:
+        params = {"exclude_offline": "true"} if exclude_offline else None
+        return self.request(Route("GET", "/servers/{server_id}/members", server_id=server_id), params=params)
 
     def ban_member(self, server_id: str, member_id: str, reason: Optional[str]) -> Request[None]:
-        return self.request("PUT", f"/servers/{server_id}/bans/{member_id}", json={"reason": reason} if reason else None, nonce=False)
+        return self.request(Route("PUT", "/servers/{server_id}/bans/{member_id}", server_id=server_id, member_id=member_id), json={"reason": reason} if reason else None, nonce=False)
 
     def unban_member(self, server_id: str, member_id: str) -> Request[None]:
-        return self.request("DELETE", f"/servers/{server_id}/bans/{member_id}")
+        return self.request(Route("DELETE", "/servers/{server_id}/bans/{member_id}", server_id=server_id, member_id=member_id))
 
     def fetch_bans(self, server_id: str) -> Request[ServerBans]:
-        return self.request("GET", f"/servers/{server_id}/bans")
+        return self.request(Route("GET", "/servers/{server_id}/bans", server_id=server_id))
 
     def create_role(self, server_id: str, name: str) -> Request[CreateRole]:
-        return self.request("POST", f"/servers/{server_id}/roles", json={"name": name}, nonce=False)
+        return self.request(Route("POST", "/servers/{server_id}/roles", server_id=server_id), json={"name": name}, nonce=False)
 
     def delete_role(self, server_id: str, role_id: str) -> Request[None]:
-        return self.request("DELETE", f"/servers/{server_id}/roles/{role_id}")
+        return self.request(Route("DELETE", "/servers/{server_id}/roles/{role_id}", server_id=server_id, role_id=role_id))
 
     def fetch_invite(self, code: str) -> Request[Invite]:
-        return self.request("GET", f"/invites/{code}")
+        return self.request(Route("GET", "/invites/{code}", code=code))
 
     def delete_invite(self, code: str) -> Request[None]:
-        return self.request("DELETE", f"/invites/{code}")
+        return self.request(Route("DELETE", "/invites/{code}", code=code))
 
     def edit_channel(self, channel_id: str, remove: Optional[list[str]], values: dict[str, Any]) -> Request[None]:
-        return self.request("PATCH", f"/channels/{channel_id}", json={**values, **({"remove": remove} if remove else {})})
+        return self.request(Route("PATCH", "/channels/{channel_id}", channel_id=channel_id), json={**values, **({"remove": remove} if remove else {})})
 
     def edit_role(self, server_id: str, role_id: str, remove: Optional[list[str]], values: dict[str, Any]) -> Request[None]:
-        return self.request("PATCH", f"/servers/{server_id}/roles/{role_id}", json={**values, **({"remove": remove} if remove else {})})
+        return self.request(Route("PATCH", "/servers/{server_id}/roles/{role_id}", server_id=server_id, role_id=role_id), json={**values, **({"remove": remove} if remove else {})})
 
     async def edit_self(self, remove: Optional[list[str]], values: dict[str, Any]) -> Request[None]:
         if remove:
@@ -378,49 +815,49 @@ class HTTPClient:
                 asset = await self.upload_file(background, "backgrounds")
                 profile["background"] = asset["id"]
 
-        return await self.request("PATCH", "/users/@me", json=values)
+        return await self.request(Route("PATCH", "/users/@me"), json=values)
 
     def set_permissions(self, endpoint: str, entity_id: str, allow: int, deny: int) -> Request[None]:
-        return self.request("PUT", f"/{endpoint}/{entity_id}/permissions", json={"permissions": {"allow": allow, "deny": deny}})
+        return self.request(Route("PUT", "/{endpoint}/{entity_id}/permissions", endpoint=endpoint, entity_id=entity_id), json={"permissions": {"allow": allow, "deny": deny}})
 
     def add_reaction(self, channel_id: str, message_id: str, emoji: str) -> Request[None]:
-        return self.request("PUT", f"/channels/{channel_id}/messages/{message_id}/reactions/{emoji}")
+        return self.request(Route("PUT", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}", channel_id=channel_id, message_id=message_id, emoji=emoji))
 
     def remove_reaction(self, channel_id: str, message_id: str, emoji: str, user_id: Optional[str] = None, remove_all: bool = False) -> Request[None]:
         params = {k: v for k, v in {"user_id": user_id, "remove_all": remove_all}.items() if v is not None}
-        return self.request("DELETE", f"/channels/{channel_id}/messages/{message_id}/reactions/{emoji}", params=params)
+        return self.request(Route("DELETE", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}", channel_id=channel_id, message_id=message_id, emoji=emoji), params=params)
 
     def remove_all_reactions(self, channel_id: str, message_id: str) -> Request[None]:
-        return self.request("DELETE", f"/channels/{channel_id}/messages/{message_id}/reactions")
+        return self.request(Route("DELETE", "/channels/{channel_id}/messages/{message_id}/reactions", channel_id=channel_id, message_id=message_id))
 
     def delete_emoji(self, emoji_id: str) -> Request[None]:
-        return self.request("DELETE", f"/custom/emoji/{emoji_id}")
+        return self.request(Route("DELETE", "/custom/emoji/{emoji_id}", emoji_id=emoji_id))
 
     def fetch_emoji(self, emoji_id: str) -> Request[EmojiPayload]:
-        return self.request("GET", f"/custom/emoji/{emoji_id}")
+        return self.request(Route("GET", "/custom/emoji/{emoji_id}", emoji_id=emoji_id))
 
     async def create_emoji(self, name: str, file: File, nsfw: bool, parent: EmojiParent) -> Request[EmojiPayload]:
         asset = await self.upload_file(file, "emojis")
-        return await self.request("PUT", f"/custom/emoji/{asset['id']}", json={"name": name, "parent": parent, "nsfw": nsfw})
+        return await self.request(Route("PUT", "/custom/emoji/{emoji_id}", emoji_id=asset['id']), json={"name": name, "parent": parent, "nsfw": nsfw})
 
     def edit_member(self, server_id: str, member_id: str, remove: Optional[list[str]], values: dict[str, Any]) -> Request[MemberPayload]:
-        return self.request("PATCH", f"/servers/{server_id}/members/{member_id}", json={**values, **({"remove": remove} if remove else {})})
+        return self.request(Route("PATCH", "/servers/{server_id}/members/{member_id}", server_id=server_id, member_id=member_id), json={**values, **({"remove": remove} if remove else {})})
 
     def delete_messages(self, channel_id: str, messages: list[str]) -> Request[None]:
-        return self.request("DELETE", f"/channels/{channel_id}/messages/bulk", json={"ids": messages})
+        return self.request(Route("DELETE", "/channels/{channel_id}/messages/bulk", channel_id=channel_id), json={"ids": messages})
     
     async def my_id(self) -> str:
-        user_data = await self.request("GET", "/users/@me")
+        user_data = await self.request(Route("GET", "/users/@me"))
         return user_data["id"]
     
 
     def fetch_all_emojis(self) -> Request[list[EmojiPayload]]:
         """Fetch all custom emojis available to the bot."""
-        return self.request("GET", "/custom/emoji")
+        return self.request(Route("GET", "/custom/emoji"))
 
     def fetch_all_private_dms(self) -> Request[list[Union[DMChannel, GroupDMChannel]]]:
         """Fetch all private DM channels."""
-        return self.request("GET", "/users/dms")
+        return self.request(Route("GET", "/users/dms"))
 
     def emojis(self) -> list[EmojiPayload]:
         """Get all custom emojis."""
@@ -430,14 +867,11 @@ class HTTPClient:
         """Get all private DM channels."""
         return self.fetch_all_private_dms()
 
-    async def ws_connect(self) -> aiohttp.ClientWebSocketResponse:
-        self.session = self.session if self.session and not self.session.closed else aiohttp.ClientSession()
+    async def ws_connect(self, *, format: Literal["json", "msgpack"] = "json") -> aiohttp.ClientWebSocketResponse:
         params = {
             'version' : '1',
-            'format' : 'json',
+            'format' : format,
             'token' : self.token
         }
-        return await self.session.ws_connect('wss://ws.revolt.chat', params=params)
-    
-    def add_to_server_cache(self, server: Server):
-        self._servers[server.id] = server
+        return await self._get_session().ws_connect(self.api_info.get('ws', 'wss://ws.revolt.chat'), params=params)
+
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+from typing import TYPE_CHECKING, AsyncIterator, Optional, Union
+
+from .enums import SortType
+from .message import Message
+from .utils import _ulid_cursor
+
+if TYPE_CHECKING:
+    from .state import ConnectionState
+    from .types import Message as MessagePayload
+
+__all__ = ("HistoryIterator",)
+
+
+class HistoryIterator:
+    """Iterates over a channel's messages with ``async for``, newest first by default.
+
+    Pages of up to :attr:`PAGE_SIZE` messages are fetched with the last
+    message's id as the cursor, and the next page is requested as soon as the
+    current one arrives, so it downloads while the current page is consumed.
+    ``limit=None`` walks the whole channel.
+
+    Messages are built straight from the payloads and are not cached, and
+    authors are not fetched along with them, so :attr:`Message.author` is only
+    resolved if the user is already cached.
+
+    .. code-block:: python
+
+        async for message in client.history(channel_id, limit=None, oldest_first=True):
+            ...
+    """
+
+    PAGE_SIZE = 100
+
+    __slots__ = ("_state", "channel_id", "limit", "before", "after", "oldest_first")
+
+    def __init__(
+        self,
+        state: ConnectionState,
+        channel_id: str,
+        *,
+        limit: Optional[int] = 100,
+        before: Union[str, datetime.datetime, None] = None,
+        after: Union[str, datetime.datetime, None] = None,
+        oldest_first: bool = False
+    ) -> None:
+        self._state: ConnectionState = state
+        self.channel_id: str = channel_id
+        self.limit: Optional[int] = limit
+        self.before: Optional[str] = _ulid_cursor(before) if isinstance(before, datetime.datetime) else before
+        self.after: Optional[str] = _ulid_cursor(after, high=True) if isinstance(after, datetime.datetime) else after
+        self.oldest_first: bool = oldest_first
+
+    def __repr__(self) -> str:
+        return f"<HistoryIterator channel_id={self.channel_id!r} limit={self.limit!r} oldest_first={self.oldest_first}>"
+
+    def __aiter__(self) -> AsyncIterator[Message]:
+        return self._iterate()
+
+    async def flatten(self) -> list[Message]:
+        return [message async for message in self]
+
+    def _fetch(self, cursor: Optional[str], limit: int) -> asyncio.Task[list[MessagePayload]]:
+        before, after = self.before, self.after
+        if cursor is not None:
+            if self.oldest_first:
+                after = cursor
+            else:
+                before = cursor
+
+        return asyncio.ensure_future(self._state.http.fetch_messages(
+            self.channel_id,
+            SortType.oldest if self.oldest_first else SortType.latest,
+            limit=limit,
+            before=before,
+            after=after
+        ))
+
+    async def _iterate(self) -> AsyncIterator[Message]:
+        state = self._state
+        remaining = self.limit
+        if remaining is not None and remaining <= 0:
+            return
+
+        page_limit = self.PAGE_SIZE if remaining is None else min(remaining, self.PAGE_SIZE)
+        pending: Optional[asyncio.Task[list[MessagePayload]]] = self._fetch(None, page_limit)
+
+        try:
+            while pending is not None:
+                page = await pending
+                pending = None
+
+                if remaining is not None:
+                    page = page[:remaining]
+                    remaining -= len(page)
+
+                # a short page means the channel has run out
+                if page and len(page) == page_limit and remaining != 0:
+                    page_limit = self.PAGE_SIZE if remaining is None else min(remaining, self.PAGE_SIZE)
+                    pending = self._fetch(page[-1]["_id"], page_limit)
+
+                for payload in page:
+                    yield Message(state, payload)
+        finally:
+            if pending is not None:
+                pending.cancel()
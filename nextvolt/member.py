@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import copy
+import datetime
+import sys
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from .asset import Asset
+from .utils import _parse_timestamp
+
+if TYPE_CHECKING:
+    from .role import Role
+    from .server import Server
+    from .state import ConnectionState
+    from .types.file import FilePayload
+    from .types.server import MemberPayload
+    from .user import User
+
+__all__ = ("Member", "MemberCachePolicy")
+
+
+class MemberCachePolicy:
+    """Decides which server members are kept in the cache.
+
+    ``online`` keeps members whose user is online, ``recently_active`` keeps
+    members who recently sent a message, up to ``max_active`` of them, least
+    recently active evicted first. The client's own members are always cached.
+    """
+
+    __slots__ = ("everyone", "online", "recently_active", "max_active")
+
+    def __init__(
+        self,
+        *,
+        online: bool = False,
+        recently_active: bool = False,
+        max_active: int = 1000
+    ) -> None:
+        self.everyone: bool = False
+        self.online: bool = online
+        self.recently_active: bool = recently_active
+        self.max_active: int = max_active
+
+    def __repr__(self) -> str:
+        if self.everyone:
+            return "<MemberCachePolicy all>"
+
+        enabled = [name for name in ("online", "recently_active") if getattr(self, name)]
+        return f"<MemberCachePolicy {' '.join(enabled) or 'none'}>"
+
+    @classmethod
+    def all(cls) -> MemberCachePolicy:
+        """Caches every member. Uses the most memory."""
+        self = cls()
+        self.everyone = True
+        return self
+
+    @classmethod
+    def none(cls) -> MemberCachePolicy:
+        """Caches only the client's own members."""
+        return cls()
+
+    @property
+    def tracks_activity(self) -> bool:
+        return not self.everyone and self.recently_active
+
+    @property
+    def online_only(self) -> bool:
+        # nothing but presence matters, so offline members needn't even be downloaded
+        return self.online and not (self.everyone or self.recently_active)
+
+
+class Member:
+    """A user's membership of a server.
+
+    Members are the most numerous cached entity, so they hold only ids and the
+    per-server fields. Everything about the user goes through :attr:`user`.
+    """
+
+    __slots__ = ("_state", "id", "server_id", "nickname", "_avatar", "role_ids", "_joined_at", "_timeout")
+
+    def __init__(self, state: ConnectionState, data: MemberPayload) -> None:
+        self._state: ConnectionState = state
+
+        self.id: str = sys.intern(data["_id"]["user"])
+        self.server_id: str = sys.intern(data["_id"]["server"])
+        self.nickname: Optional[str] = None
+        self._avatar: Optional[FilePayload] = None
+        self.role_ids: tuple[str, ...] = ()
+        self._joined_at: Optional[str] = None
+        self._timeout: Optional[str] = None
+
+        self._update(data)
+
+    def __repr__(self) -> str:
+        return f"<Member id={self.id!r} server_id={self.server_id!r}>"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Member) and other.id == self.id and other.server_id == self.server_id
+
+    def __hash__(self) -> int:
+        return hash((self.server_id, self.id))
+
+    def _update(self, data: dict[str, Any], clear: Union[str, list[str], None] = None) -> None:
+        if "nickname" in data:
+            self.nickname = data["nickname"]
+        if "avatar" in data:
+            self._avatar = data["avatar"]
+        if "roles" in data:
+            self.role_ids = tuple(sys.intern(role_id) for role_id in data["roles"])
+        if "joined_at" in data:
+            self._joined_at = data["joined_at"]
+        if "timeout" in data:
+            self._timeout = data["timeout"]
+
+        if clear:
+            for field in [clear] if isinstance(clear, str) else clear:
+                if field == "Nickname":
+                    self.nickname = None
+                elif field == "Avatar":
+                    self._avatar = None
+                elif field == "Roles":
+                    self.role_ids = ()
+                elif field == "Timeout":
+                    self._timeout = None
+
+    def _copy(self) -> Member:
+        return copy.copy(self)
+
+    @property
+    def user(self) -> Optional[User]:
+        return self._state.get_user(self.id)
+
+    @property
+    def server(self) -> Optional[Server]:
+        return self._state.get_server(self.server_id)
+
+    @property
+    def display_name(self) -> Optional[str]:
+        if self.nickname is not None:
+            return self.nickname
+
+        user = self.user
+        return user.display_name if user is not None else None
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    @property
+    def avatar(self) -> Optional[Asset]:
+        """The server-specific avatar, if one is set."""
+        return Asset(self._state, self._avatar) if self._avatar is not None else None
+
+    @property
+    def roles(self) -> list[Role]:
+        server = self.server
+        if server is None:
+            return []
+
+        return [role for role in map(server.get_role, self.role_ids) if role is not None]
+
+    @property
+    def joined_at(self) -> Optional[datetime.datetime]:
+        return _parse_timestamp(self._joined_at)
+
+    @property
+    def timed_out_until(self) -> Optional[datetime.datetime]:
+        return _parse_timestamp(self._timeout)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from .asset import Asset
+from .utils import _apply_update, _clear_cached_slots, _parse_timestamp, _ulid_timestamp, cached_slot_property
+
+if TYPE_CHECKING:
+    from .channel import Channel
+    from .server import Server
+    from .state import ConnectionState
+    from .types.embed import EmbedPayload
+    from .types.message import Masquerade
+    from .types.message import Message as MessagePayload
+    from .user import User
+
+__all__ = ("Message",)
+
+
+class Message:
+    """A message sent in a channel.
+
+    Only the ids and ``content`` are read up front. Attachments, embeds,
+    mentions, reactions and the resolved author and channel are decoded from the
+    raw payload on first access and cached until the message is edited.
+    """
+
+    __slots__ = (
+        "_state",
+        "_data",
+        "id",
+        "channel_id",
+        "author_id",
+        "content",
+        "_cs_author",
+        "_cs_channel",
+        "_cs_attachments",
+        "_cs_embeds",
+        "_cs_mentions",
+        "_cs_reactions",
+        "_cs_edited_at",
+        "_cs_created_at",
+    )
+
+    def __init__(self, state: ConnectionState, data: MessagePayload) -> None:
+        self._state: ConnectionState = state
+        self._data: MessagePayload = data
+
+        self.id: str = data["_id"]
+        self.channel_id: str = data["channel"]
+        self.author_id: str = data["author"]
+        self.content: str = data.get("content", "")
+
+    def __repr__(self) -> str:
+        return f"<Message id={self.id!r} channel_id={self.channel_id!r} author_id={self.author_id!r}>"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Message) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def _update(self, data: dict[str, Any], clear: Union[str, list[str], None] = None) -> None:
+        _apply_update(self._data, data, clear)
+        self.content = self._data.get("content", "")
+        _clear_cached_slots(self)
+
+    def _copy(self) -> Message:
+        data = dict(self._data)
+        if "reactions" in data:
+            # reactions are edited in place
+            data["reactions"] = {emoji: list(users) for emoji, users in data["reactions"].items()}
+        return Message(self._state, data)
+
+    def _add_reaction(self, emoji_id: str, user_id: str) -> None:
+        users = self._data.setdefault("reactions", {}).setdefault(emoji_id, [])
+        if user_id not in users:
+            users.append(user_id)
+        _clear_cached_slots(self)
+
+    def _remove_reaction(self, emoji_id: str, user_id: Optional[str] = None) -> None:
+        reactions = self._data.get("reactions", {})
+        users = reactions.get(emoji_id)
+        if users is None:
+            return
+
+        if user_id is None:
+            del reactions[emoji_id]
+        elif user_id in users:
+            users.remove(user_id)
+            if not users:
+                del reactions[emoji_id]
+        _clear_cached_slots(self)
+
+    @property
+    def server_id(self) -> Optional[str]:
+        channel = self.channel
+        return channel.server_id if channel is not None else None
+
+    @property
+    def server(self) -> Optional[Server]:
+        server_id = self.server_id
+        return self._state.get_server(server_id) if server_id is not None else None
+
+    @property
+    def masquerade(self) -> Optional[Masquerade]:
+        return self._data.get("masquerade")
+
+    @property
+    def reply_ids(self) -> list[str]:
+        return self._data.get("replies", [])
+
+    @property
+    def mention_ids(self) -> list[str]:
+        return self._data.get("mentions", [])
+
+    @cached_slot_property("_cs_author")
+    def author(self) -> Optional[User]:
+        return self._state.get_user(self.author_id)
+
+    @cached_slot_property("_cs_channel")
+    def channel(self) -> Optional[Channel]:
+        return self._state.get_channel(self.channel_id)
+
+    @cached_slot_property("_cs_attachments")
+    def attachments(self) -> list[Asset]:
+        return [Asset(self._state, attachment) for attachment in self._data.get("attachments", ())]
+
+    @cached_slot_property("_cs_embeds")
+    def embeds(self) -> list[EmbedPayload]:
+        return list(self._data.get("embeds", ()))
+
+    @cached_slot_property("_cs_mentions")
+    def mentions(self) -> list[User]:
+        """The mentioned users that are in the cache."""
+        get_user = self._state.get_user
+        return [user for user in map(get_user, self.mention_ids) if user is not None]
+
+    @cached_slot_property("_cs_reactions")
+    def reactions(self) -> dict[str, list[str]]:
+        """Emoji id to the ids of the users who reacted with it."""
+        return {emoji: list(users) for emoji, users in self._data.get("reactions", {}).items()}
+
+    @cached_slot_property("_cs_edited_at")
+    def edited_at(self) -> Optional[datetime.datetime]:
+        return _parse_timestamp(self._data.get("edited"))
+
+    @cached_slot_property("_cs_created_at")
+    def created_at(self) -> datetime.datetime:
+        return _ulid_timestamp(self.id)
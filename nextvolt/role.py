@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import copy
+import sys
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+if TYPE_CHECKING:
+    from .server import Server
+    from .state import ConnectionState
+    from .types.server import RolePayload
+
+__all__ = ("Role",)
+
+
+class Role:
+    """A role in a server."""
+
+    __slots__ = ("_state", "id", "server_id", "name", "allow", "deny", "colour", "hoist", "rank")
+
+    def __init__(self, state: ConnectionState, server_id: str, role_id: str, data: RolePayload) -> None:
+        self._state: ConnectionState = state
+
+        self.id: str = sys.intern(role_id)
+        self.server_id: str = sys.intern(server_id)
+        self.name: str = ""
+        self.allow: int = 0
+        self.deny: int = 0
+        self.colour: Optional[str] = None
+        self.hoist: bool = False
+        self.rank: int = 0
+
+        self._update(data)
+
+    def __repr__(self) -> str:
+        return f"<Role id={self.id!r} name={self.name!r}>"
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Role) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def _update(self, data: dict[str, Any], clear: Union[str, list[str], None] = None) -> None:
+        if "name" in data:
+            self.name = data["name"]
+        if "permissions" in data:
+            self.allow = data["permissions"]["a"]
+            self.deny = data["permissions"]["d"]
+        if "colour" in data:
+            self.colour = data["colour"]
+        if "hoist" in data:
+            self.hoist = data["hoist"]
+        if "rank" in data:
+            self.rank = data["rank"]
+
+        if clear and "Colour" in ([clear] if isinstance(clear, str) else clear):
+            self.colour = None
+
+    def _copy(self) -> Role:
+        return copy.copy(self)
+
+    @property
+    def permissions(self) -> tuple[int, int]:
+        """The allowed and denied permission bits."""
+        return self.allow, self.deny
+
+    @property
+    def server(self) -> Optional[Server]:
+        return self._state.get_server(self.server_id)
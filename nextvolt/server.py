@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import copy
+import datetime
+import sys
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from .asset import Asset
+from .role import Role
+from .utils import _clear_cached_slots, _ulid_timestamp, cached_slot_property
+
+if TYPE_CHECKING:
+    from .channel import Channel
+    from .member import Member
+    from .state import ConnectionState
+    from .types.channel import CategoryPayload
+    from .types.file import FilePayload
+    from .types.server import Server as ServerPayload
+    from .types.server import SystemMessagesConfig
+    from .user import User
+
+__all__ = ("Server",)
+
+
+class Server:
+    """A Revolt server.
+
+    Fields are copied out of the payload into slots and the payload itself is
+    not kept. The channel list and assets are resolved on first access and
+    cached until the next update.
+    """
+
+    __slots__ = (
+        "_state",
+        "id",
+        "name",
+        "owner_id",
+        "description",
+        "channel_ids",
+        "categories",
+        "system_messages",
+        "default_permissions",
+        "nsfw",
+        "flags",
+        "_roles",
+        "_icon",
+        "_banner",
+        "_cs_channels",
+        "_cs_icon",
+        "_cs_banner",
+        "_cs_created_at",
+    )
+
+    def __init__(self, state: ConnectionState, data: ServerPayload) -> None:
+        self._state: ConnectionState = state
+
+        self.id: str = sys.intern(data["_id"])
+        self.name: str = data["name"]
+        self.owner_id: str = sys.intern(data["owner"])
+        self.description: Optional[str] = None
+        self.channel_ids: tuple[str, ...] = ()
+        self.categories: Optional[list[CategoryPayload]] = None
+        self.system_messages: Optional[SystemMessagesConfig] = None
+        self.default_permissions: int = 0
+        self.nsfw: bool = False
+        self.flags: int = 0
+        self._roles: dict[str, Role] = {}
+        self._icon: Optional[FilePayload] = None
+        self._banner: Optional[FilePayload] = None
+
+        self._update(data)
+
+    def __repr__(self) -> str:
+        return f"<Server id={self.id!r} name={self.name!r}>"
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Server) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def _update(self, data: dict[str, Any], clear: Union[str, list[str], None] = None) -> None:
+        if "name" in data:
+            self.name = data["name"]
+        if "owner" in data:
+            self.owner_id = sys.intern(data["owner"])
+        if "description" in data:
+            self.description = data["description"]
+        if "channels" in data:
+            self.channel_ids = tuple(sys.intern(channel_id) for channel_id in data["channels"])
+        if "categories" in data:
+            self.categories = data["categories"]
+        if "system_messages" in data:
+            self.system_messages = data["system_messages"]
+        if "default_permissions" in data:
+            self.default_permissions = data["default_permissions"]
+        if "nsfw" in data:
+            self.nsfw = data["nsfw"]
+        if "flags" in data:
+            self.flags = data["flags"]
+        if "roles" in data:
+            self._roles = {
+                role_id: Role(self._state, self.id, role_id, role) for role_id, role in data["roles"].items()
+            }
+        if "icon" in data:
+            self._icon = data["icon"]
+        if "banner" in data:
+            self._banner = data["banner"]
+
+        if clear:
+            for field in [clear] if isinstance(clear, str) else clear:
+                if field == "Icon":
+                    self._icon = None
+                elif field == "Banner":
+                    self._banner = None
+                elif field == "Description":
+                    self.description = None
+                elif field == "Categories":
+                    self.categories = None
+                elif field == "SystemMessages":
+                    self.system_messages = None
+
+        _clear_cached_slots(self)
+
+    def _copy(self) -> Server:
+        server = copy.copy(self)
+        # roles are edited in place
+        server._roles = {role_id: role._copy() for role_id, role in self._roles.items()}
+        return server
+
+    def _add_channel(self, channel_id: str) -> None:
+        if channel_id not in self.channel_ids:
+            self.channel_ids = self.channel_ids + (sys.intern(channel_id),)
+            _clear_cached_slots(self)
+
+    def _remove_channel(self, channel_id: str) -> None:
+        if channel_id in self.channel_ids:
+            self.channel_ids = tuple(other for other in self.channel_ids if other != channel_id)
+            _clear_cached_slots(self)
+
+    def _put_role(self, role: Role) -> None:
+        self._roles[role.id] = role
+
+    def _pop_role(self, role_id: str) -> Optional[Role]:
+        return self._roles.pop(role_id, None)
+
+    @property
+    def owner(self) -> Optional[User]:
+        return self._state.get_user(self.owner_id)
+
+    @property
+    def members(self) -> list[Member]:
+        return self._state.get_members(self.id)
+
+    @property
+    def roles(self) -> list[Role]:
+        return list(self._roles.values())
+
+    def get_member(self, user_id: str) -> Optional[Member]:
+        return self._state.get_member(self.id, user_id)
+
+    async def load_members(self, *, chunk_size: int = 1000) -> int:
+        """Fetches the member list and caches the members the client's member cache policy allows.
+
+        Returns the number of members cached.
+        """
+        return await self._state.load_members(self.id, chunk_size=chunk_size)
+
+    def get_role(self, role_id: str) -> Optional[Role]:
+        return self._roles.get(role_id)
+
+    @cached_slot_property("_cs_channels")
+    def channels(self) -> list[Channel]:
+        get_channel = self._state.get_channel
+        return [channel for channel in map(get_channel, self.channel_ids) if channel is not None]
+
+    @cached_slot_property("_cs_icon")
+    def icon(self) -> Optional[Asset]:
+        return Asset(self._state, self._icon) if self._icon is not None else None
+
+    @cached_slot_property("_cs_banner")
+    def banner(self) -> Optional[Asset]:
+        return Asset(self._state, self._banner) if self._banner is not None else None
+
+    @cached_slot_property("_cs_created_at")
+    def created_at(self) -> datetime.datetime:
+        return _ulid_timestamp(self.id)
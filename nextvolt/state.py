@@ -0,0 +1,812 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterator, Literal, Optional, Union
+
+from .activity import ReactionBatch, ReactionBatcher, TypingCoalescer
+from .channel import Channel
+from .emoji import Emoji
+from .enums import SortType
+from .errors import HTTPException
+from .member import Member, MemberCachePolicy
+from .message import Message
+from .role import Role
+from .server import Server
+from .user import ClientUser, User
+
+if TYPE_CHECKING:
+    from .client import Client
+    from .http import HTTPClient
+    from .types import Channel as ChannelPayload
+    from .types import Emoji as EmojiPayload
+    from .types import Message as MessagePayload
+    from .types import Server as ServerPayload
+    from .types import User as UserPayload
+    from .types import gateway as gw
+    from .types.server import MemberPayload
+
+__all__ = ("MessageCache", "ConnectionState")
+
+_log = logging.getLogger(__name__)
+
+# UserUpdate fields and clears that only concern presence
+_PRESENCE_FIELDS = frozenset({"online", "status"})
+_PRESENCE_CLEAR = frozenset({"StatusText", "StatusPresence"})
+
+
+def _parser_event_name(attr: str) -> str:
+    # parse_server_member_join -> ServerMemberJoin
+    return "".join(part.capitalize() for part in attr[6:].split("_"))
+
+
+class MessageCache:
+    """A bounded cache of messages keyed by id.
+
+    Holds at most ``max_messages`` messages overall and, optionally, at most
+    ``max_per_channel`` per channel. With the ``"fifo"`` policy the oldest
+    message is evicted first; with ``"lru"`` reads count as use. Lookups,
+    inserts, deletes and evictions are all O(1).
+    """
+
+    __slots__ = ("max_messages", "max_per_channel", "policy", "_messages", "_channels")
+
+    def __init__(
+        self,
+        max_messages: int,
+        *,
+        max_per_channel: Optional[int] = None,
+        policy: Literal["fifo", "lru"] = "fifo"
+    ) -> None:
+        if policy not in ("fifo", "lru"):
+            raise ValueError(f"Unknown message cache policy {policy!r}")
+
+        self.max_messages: int = max_messages
+        self.max_per_channel: Optional[int] = max_per_channel
+        self.policy: Literal["fifo", "lru"] = policy
+
+        self._messages: OrderedDict[str, Message] = OrderedDict()
+        # channel id -> ids of its cached messages, oldest first
+        self._channels: dict[str, OrderedDict[str, None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __contains__(self, message_id: str) -> bool:
+        return message_id in self._messages
+
+    def __iter__(self) -> Iterator[Message]:
+        return iter(list(self._messages.values()))
+
+    def get(self, message_id: str) -> Optional[Message]:
+        message = self._messages.get(message_id)
+
+        if message is not None and self.policy == "lru":
+            self._messages.move_to_end(message_id)
+            self._channels[message.channel_id].move_to_end(message_id)
+
+        return message
+
+    def add(self, message: Message) -> None:
+        if self.max_messages <= 0:
+            return
+
+        message_id = message.id
+        channel_id = message.channel_id
+
+        self._messages[message_id] = message
+        self._messages.move_to_end(message_id)
+
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            channel = self._channels[channel_id] = OrderedDict()
+        channel[message_id] = None
+        channel.move_to_end(message_id)
+
+        if self.max_per_channel is not None and len(channel) > self.max_per_channel:
+            oldest, _ = channel.popitem(last=False)
+            del self._messages[oldest]
+
+        if len(self._messages) > self.max_messages:
+            oldest, evicted = self._messages.popitem(last=False)
+            self._forget(evicted.channel_id, oldest)
+
+    def pop(self, message_id: str) -> Optional[Message]:
+        message = self._messages.pop(message_id, None)
+        if message is not None:
+            self._forget(message.channel_id, message_id)
+        return message
+
+    def pop_many(self, message_ids: list[str]) -> list[Message]:
+        """Removes every cached message in ``message_ids``, returning the ones found."""
+        messages = []
+        pop = self._messages.pop
+
+        for message_id in message_ids:
+            message = pop(message_id, None)
+            if message is not None:
+                messages.append(message)
+                self._channels[message.channel_id].pop(message_id, None)
+
+        for channel_id in {message.channel_id for message in messages}:
+            if not self._channels[channel_id]:
+                del self._channels[channel_id]
+
+        return messages
+
+    def remove_channel(self, channel_id: str) -> None:
+        for message_id in self._channels.pop(channel_id, ()):
+            del self._messages[message_id]
+
+    def clear(self) -> None:
+        self._messages.clear()
+        self._channels.clear()
+
+    def _forget(self, channel_id: str, message_id: str) -> None:
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            return
+
+        channel.pop(message_id, None)
+        if not channel:
+            del self._channels[channel_id]
+
+
+class ConnectionState:
+    """Caches the entities the gateway tells us about.
+
+    The cache is filled from the ``Ready`` event and kept up to date by the
+    ``parse_*`` handlers, one per gateway event type, which also dispatch the
+    matching client events. Every lookup is a single dict access.
+    """
+
+    # a resume that missed more than this falls back to a full resync
+    MAX_REPLAY_CHANNELS = 50
+    MAX_REPLAY_MESSAGES = 100
+
+    def __init__(
+        self,
+        client: Client,
+        http: HTTPClient,
+        *,
+        max_messages: int = 1000,
+        max_messages_per_channel: Optional[int] = None,
+        message_cache_policy: Literal["fifo", "lru"] = "fifo",
+        member_cache_policy: Optional[MemberCachePolicy] = None,
+        ready_chunk_size: int = 1000,
+        typing_coalesce_window: Optional[float] = None,
+        reaction_batch_window: Optional[float] = None
+    ) -> None:
+        self.client: Client = client
+        self.http: HTTPClient = http
+        self.dispatch: Callable[..., None] = client.dispatch
+        # whether an event has handlers or waiters, to skip building what nobody receives
+        self.handles: Callable[[str], bool] = client._is_handled
+        self.messages: MessageCache = MessageCache(
+            max_messages, max_per_channel=max_messages_per_channel, policy=message_cache_policy
+        )
+        self.member_cache_policy: MemberCachePolicy = member_cache_policy or MemberCachePolicy.all()
+        # Ready entries stored between yields to the event loop
+        self.ready_chunk_size: int = max(1, ready_chunk_size)
+        # seconds spent storing each part of the last Ready, plus "total"
+        self.ready_timings: dict[str, float] = {}
+        # debounces typing events when a coalescing window is set; outlives clear()
+        # so users typing across a reconnect still get their typing_stop
+        self.typing: Optional[TypingCoalescer] = None
+        if typing_coalesce_window is not None:
+            self.typing = TypingCoalescer(
+                self._dispatch_typing, self._dispatch_channel_activity, window=typing_coalesce_window
+            )
+        # groups reaction events per message into reaction_batch when a window is set
+        self.reactions: Optional[ReactionBatcher] = None
+        if reaction_batch_window is not None:
+            self.reactions = ReactionBatcher(self._dispatch_reaction_batch, window=reaction_batch_window)
+
+        # gateway event type -> handler; async handlers (Ready) return an awaitable
+        self.parsers: dict[str, Callable[[Any], Optional[Awaitable[None]]]] = {
+            _parser_event_name(attr): getattr(self, attr)
+            for attr in dir(type(self))
+            if attr.startswith("parse_")
+        }
+
+        self.clear()
+
+    def clear(self) -> None:
+        self.user_id: Optional[str] = None
+
+        self._users: dict[str, User] = {}
+        self._servers: dict[str, Server] = {}
+        self._channels: dict[str, Channel] = {}
+        # server id -> user id -> member, so a whole server can be dropped at once
+        self._members: dict[str, dict[str, Member]] = {}
+        # (server id, user id) of members kept for being recently active, least recent first
+        self._active_members: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self._emojis: dict[str, Emoji] = {}
+
+    # lookups
+
+    @property
+    def user(self) -> Optional[ClientUser]:
+        return self._users.get(self.user_id) if self.user_id else None  # type: ignore
+
+    @property
+    def users(self) -> list[User]:
+        return list(self._users.values())
+
+    @property
+    def servers(self) -> list[Server]:
+        return list(self._servers.values())
+
+    @property
+    def channels(self) -> list[Channel]:
+        return list(self._channels.values())
+
+    @property
+    def private_channels(self) -> list[Channel]:
+        return [channel for channel in self._channels.values() if channel.server_id is None]
+
+    @property
+    def emojis(self) -> list[Emoji]:
+        return list(self._emojis.values())
+
+    def get_user(self, user_id: str) -> Optional[User]:
+        return self._users.get(user_id)
+
+    def get_server(self, server_id: str) -> Optional[Server]:
+        return self._servers.get(server_id)
+
+    def get_channel(self, channel_id: str) -> Optional[Channel]:
+        return self._channels.get(channel_id)
+
+    def get_member(self, server_id: str, user_id: str) -> Optional[Member]:
+        members = self._members.get(server_id)
+        return members.get(user_id) if members is not None else None
+
+    def get_members(self, server_id: str) -> list[Member]:
+        return list(self._members.get(server_id, {}).values())
+
+    def get_emoji(self, emoji_id: str) -> Optional[Emoji]:
+        return self._emojis.get(emoji_id)
+
+    def get_message(self, message_id: str) -> Optional[Message]:
+        return self.messages.get(message_id)
+
+    # storage
+
+    def store_user(self, payload: UserPayload) -> User:
+        cached = self._users.get(payload["_id"])
+        if cached is not None:
+            cached._update(payload)
+            return cached
+
+        cls = ClientUser if payload.get("relationship") == "User" else User
+        user = cls(self, payload)
+        self._users[user.id] = user
+        return user
+
+    def store_server(self, payload: ServerPayload) -> Server:
+        server = Server(self, payload)
+        self._servers[server.id] = server
+        self._members.setdefault(server.id, {})
+        return server
+
+    def store_channel(self, payload: ChannelPayload) -> Channel:
+        channel = Channel(self, payload)
+        self._channels[channel.id] = channel
+        return channel
+
+    def store_member(self, payload: MemberPayload) -> Member:
+        """Builds a member and caches it if the member cache policy allows."""
+
+        member = Member(self, payload)
+        if self._should_cache_member(member.server_id, member.id):
+            self._members.setdefault(member.server_id, {})[member.id] = member
+        return member
+
+    def _should_cache_member(self, server_id: str, user_id: str) -> bool:
+        policy = self.member_cache_policy
+        if policy.everyone or user_id == self.user_id:
+            return True
+
+        if policy.online:
+            user = self._users.get(user_id)
+            if user is not None and user.online:
+                return True
+
+        return (server_id, user_id) in self._active_members
+
+    def _uncache_member(self, server_id: str, user_id: str) -> None:
+        if not self._should_cache_member(server_id, user_id):
+            members = self._members.get(server_id)
+            if members is not None:
+                members.pop(user_id, None)
+
+    def _member_active(self, channel: Channel, payload: Optional[MemberPayload]) -> None:
+        # called for every server message, so the common cases return early
+        policy = self.member_cache_policy
+        if not policy.tracks_activity or payload is None:
+            return
+
+        key = (channel.server_id, payload["_id"]["user"])
+        active = self._active_members
+        if key in active:
+            active.move_to_end(key)
+        else:
+            active[key] = None
+            if len(active) > policy.max_active:
+                evicted, _ = active.popitem(last=False)
+                self._uncache_member(*evicted)
+
+        self.store_member(payload)
+
+    async def load_members(self, server_id: str, *, chunk_size: int = 1000) -> int:
+        """Fetches a server's members and caches those the member cache policy allows.
+
+        The response is decoded once, but members and users are only turned into
+        objects ``chunk_size`` at a time, yielding to the event loop between
+        chunks, and entries the policy rejects are never built at all. Returns
+        the number of members cached.
+        """
+
+        policy = self.member_cache_policy
+        payload = await self.http.fetch_members(server_id, exclude_offline=policy.online_only)
+        users = {user["_id"]: user for user in payload["users"]}
+        members = payload["members"]
+        del payload
+
+        cached = 0
+        for start in range(0, len(members), chunk_size):
+            for index in range(start, min(start + chunk_size, len(members))):
+                member = members[index]
+                # drop our reference so each raw entry is freed as soon as it's been handled
+                members[index] = None  # type: ignore
+                user_id = member["_id"]["user"]
+
+                user = users.pop(user_id, None)
+                if user is not None and (policy.everyone or policy.online and user.get("online")):
+                    self.store_user(user)
+
+                if self._should_cache_member(server_id, user_id):
+                    self.store_member(member)
+                    cached += 1
+
+            await asyncio.sleep(0)
+
+        _log.debug("Cached %d of %d members of server %s", cached, len(members), server_id)
+        return cached
+
+    def store_emoji(self, payload: EmojiPayload) -> Emoji:
+        emoji = Emoji(self, payload)
+        self._emojis[emoji.id] = emoji
+        return emoji
+
+    def _remove_server(self, server_id: str) -> Optional[Server]:
+        server = self._servers.pop(server_id, None)
+        self._members.pop(server_id, None)
+
+        if server is not None:
+            for channel_id in server.channel_ids:
+                self._channels.pop(channel_id, None)
+                self.messages.remove_channel(channel_id)
+
+        for emoji_id in [
+            emoji.id for emoji in self._emojis.values() if emoji.server_id == server_id
+        ]:
+            del self._emojis[emoji_id]
+
+        return server
+
+    # gateway events
+
+    async def _store_chunked(self, items: list[Any], store: Callable[[Any], Any]) -> float:
+        # returns the time spent storing, not counting the time given to other tasks
+        chunk_size = self.ready_chunk_size
+        elapsed = 0.0
+
+        for start in range(0, len(items), chunk_size):
+            began = time.perf_counter()
+            for item in items[start:start + chunk_size]:
+                store(item)
+            elapsed += time.perf_counter() - began
+
+            await asyncio.sleep(0)
+
+        return elapsed
+
+    async def parse_ready(self, data: gw.ReadyEventPayload) -> None:
+        self.clear()
+        await self._ingest_ready(data)
+        self.client._handle_ready(resumed=False)
+
+    async def resume_ready(self, data: gw.ReadyEventPayload, cursor: str) -> Optional[set[str]]:
+        """Handles the Ready of a reconnection whose last seen message id was ``cursor``.
+
+        Revolt sends a full Ready on every connection and has no replay of its
+        own, so the Ready is merged into the existing cache (keeping loaded
+        members and cached messages), and the messages sent since ``cursor`` are
+        fetched and dispatched as normal ``message`` events. If too much was
+        missed for that, the cursor is treated as invalid and the cache is
+        rebuilt from scratch as on a first connection.
+
+        Returns the ids of the replayed messages, so the gateway can skip those
+        that also arrived live while they were being fetched.
+        """
+
+        if self.user_id is None:
+            await self.parse_ready(data)
+            return None
+
+        try:
+            missed = await self._fetch_missed_messages(data.get("channels", []), cursor)
+        except Exception:
+            # without the missed messages the cursor is as good as invalid
+            _log.warning("Catching up from %s failed, doing a full resync", cursor, exc_info=True)
+            await self.parse_ready(data)
+            return None
+
+        if missed is None:
+            _log.info("Resume cursor %s is too old, doing a full resync", cursor)
+            await self.parse_ready(data)
+            return None
+
+        server_ids = set(self._servers)
+        channel_ids = set(self._channels)
+        self._emojis.clear()
+
+        await self._ingest_ready(data)
+
+        # whatever the Ready didn't mention was deleted or left while we were away
+        for server_id in server_ids.difference(server["_id"] for server in data.get("servers", ())):
+            server = self._remove_server(server_id)
+            if server is not None:
+                self.dispatch("server_delete", server)
+
+        for channel_id in channel_ids.difference(channel["_id"] for channel in data.get("channels", ())):
+            self.messages.remove_channel(channel_id)
+            channel = self._channels.pop(channel_id, None)
+            if channel is not None:
+                self.dispatch("channel_delete", channel)
+
+        for message in missed:
+            self.parse_message(message)
+
+        _log.info("Resumed from %s, replayed %d missed messages", cursor, len(missed))
+        self.client._handle_ready(resumed=True)
+        return {message["_id"] for message in missed}
+
+    async def _fetch_missed_messages(self, channels: list[ChannelPayload], cursor: str) -> Optional[list[MessagePayload]]:
+        # ULIDs sort by creation time, so any channel whose last message sorts
+        # after the cursor has messages we haven't seen. None means too many.
+        stale = [
+            channel["_id"] for channel in channels
+            if channel.get("last_message_id") is not None and channel["last_message_id"] > cursor
+        ]
+        if len(stale) > self.MAX_REPLAY_CHANNELS:
+            return None
+
+        semaphore = asyncio.Semaphore(4)
+        too_many = False
+
+        async def fetch(channel_id: str) -> list[MessagePayload]:
+            nonlocal too_many
+            async with semaphore:
+                if too_many:
+                    return []
+                try:
+                    messages = await self.http.fetch_messages(
+                        channel_id, SortType.oldest, after=cursor, limit=self.MAX_REPLAY_MESSAGES
+                    )
+                except HTTPException as exc:
+                    _log.warning("Could not fetch missed messages in %s: %s", channel_id, exc)
+                    return []
+
+            if len(messages) >= self.MAX_REPLAY_MESSAGES:
+                too_many = True
+            return messages
+
+        # every fetch finishes before a failure is raised, so none is left running
+        results = await asyncio.gather(*map(fetch, stale), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        if too_many:
+            return None
+
+        return sorted((message for messages in results for message in messages), key=lambda message: message["_id"])  # type: ignore
+
+    async def _ingest_ready(self, data: gw.ReadyEventPayload) -> None:
+        # Big accounts have hundreds of thousands of entries, so they're stored
+        # ready_chunk_size at a time, yielding in between to let heartbeats and
+        # handlers run. The gateway holds back later events until this is done.
+        began = time.perf_counter()
+
+        users = data.get("users", [])
+        for user in users:
+            if user.get("relationship") == "User":
+                self.user_id = user["_id"]
+                break
+
+        timings = self.ready_timings = {}
+        timings["users"] = await self._store_chunked(users, self.store_user)
+        timings["servers"] = await self._store_chunked(data.get("servers", []), self.store_server)
+        timings["channels"] = await self._store_chunked(data.get("channels", []), self.store_channel)
+        timings["members"] = await self._store_chunked(data.get("members", []), self.store_member)
+        timings["emojis"] = await self._store_chunked(data.get("emojis", []), self.store_emoji)
+        timings["total"] = time.perf_counter() - began
+
+        _log.info(
+            "Cached %d users, %d servers, %d channels and %d emojis from Ready in %.3fs (%.3fs of work)",
+            len(self._users), len(self._servers), len(self._channels), len(self._emojis),
+            timings["total"], sum(value for key, value in timings.items() if key != "total")
+        )
+
+    def parse_message(self, data: gw.MessageEventPayload) -> None:
+        channel = self._channels.get(data["channel"])
+        if channel is not None:
+            channel.last_message_id = data["_id"]
+
+        if channel is not None and channel.server_id is not None:
+            self._member_active(channel, data.get("member"))
+
+        # The message keeps and later edits its payload, and the frame itself was
+        # already handed to socket_raw_receive, so it gets its own copy.
+        message = Message(self, {key: value for key, value in data.items() if key != "type"})  # type: ignore
+        self.messages.add(message)
+        self.dispatch("message", message)
+
+    def parse_message_update(self, data: gw.MessageUpdateEventPayload) -> None:
+        self.dispatch("raw_message_update", data)
+
+        message = self.messages.get(data["id"])
+        if message is None:
+            return
+
+        # the copy is only worth making if someone receives it
+        before = message._copy() if self.handles("message_update") else None
+        message._update(data.get("data", {}), data.get("clear"))
+        if before is not None:
+            self.dispatch("message_update", before, message)
+
+    def parse_message_delete(self, data: gw.MessageDeleteEventPayload) -> None:
+        self.dispatch("raw_message_delete", data)
+
+        message = self.messages.pop(data["id"])
+        if message is not None:
+            self.dispatch("message_delete", message)
+
+    def parse_bulk_message_delete(self, data: gw.BulkMessageDeleteEventPayload) -> None:
+        self.dispatch("raw_bulk_message_delete", data)
+
+        messages = self.messages.pop_many(data["ids"])
+        if messages:
+            self.dispatch("bulk_message_delete", messages)
+
+    def parse_message_react(self, data: gw.MessageReactEventPayload) -> None:
+        message = self.messages.get(data["id"])
+        if message is not None:
+            message._add_reaction(data["emoji_id"], data["user_id"])
+
+        if self.reactions is not None:
+            self.reactions.add(data["id"], data["channel_id"], data["emoji_id"], data["user_id"])
+            return
+
+        self.dispatch("raw_reaction_add", data)
+        if message is not None:
+            self.dispatch("reaction_add", message, self._users.get(data["user_id"]), data["emoji_id"])
+
+    def parse_message_unreact(self, data: gw.MessageUnreactEventPayload) -> None:
+        message = self.messages.get(data["id"])
+        if message is not None:
+            message._remove_reaction(data["emoji_id"], data["user_id"])
+
+        if self.reactions is not None:
+            self.reactions.remove(data["id"], data["channel_id"], data["emoji_id"], data["user_id"])
+            return
+
+        self.dispatch("raw_reaction_remove", data)
+        if message is not None:
+            self.dispatch("reaction_remove", message, self._users.get(data["user_id"]), data["emoji_id"])
+
+    def parse_message_remove_reaction(self, data: gw.MessageRemoveReactionEventPayload) -> None:
+        message = self.messages.get(data["id"])
+        if message is not None:
+            message._remove_reaction(data["emoji_id"])
+
+        if self.reactions is not None:
+            self.reactions.clear_emoji(data["id"], data["channel_id"], data["emoji_id"])
+            return
+
+        self.dispatch("raw_reaction_clear", data)
+        if message is not None:
+            self.dispatch("reaction_clear", message, data["emoji_id"])
+
+    def _dispatch_reaction_batch(self, batch: ReactionBatch) -> None:
+        batch.message = self.messages.get(batch.message_id)
+        self.dispatch("reaction_batch", batch)
+
+    def parse_channel_create(self, data: ChannelPayload) -> None:
+        # the channel is sent inline, next to the event type, which Channel ignores
+        channel = self.store_channel(data)
+
+        if channel.server_id is not None:
+            server = self._servers.get(channel.server_id)
+            if server is not None:
+                server._add_channel(channel.id)
+
+        self.dispatch("channel_create", channel)
+
+    def parse_channel_update(self, data: gw.ChannelUpdateEventPayload) -> None:
+        channel = self._channels.get(data["id"])
+        if channel is None:
+            return
+
+        before = channel._copy() if self.handles("channel_update") else None
+        channel._update(data.get("data", {}), data.get("clear"))
+        if before is not None:
+            self.dispatch("channel_update", before, channel)
+
+    def parse_channel_delete(self, data: gw.ChannelDeleteEventPayload) -> None:
+        self.messages.remove_channel(data["id"])
+
+        channel = self._channels.pop(data["id"], None)
+        if channel is None:
+            return
+
+        if channel.server_id is not None:
+            server = self._servers.get(channel.server_id)
+            if server is not None:
+                server._remove_channel(channel.id)
+
+        self.dispatch("channel_delete", channel)
+
+    def parse_channel_group_join(self, data: dict[str, Any]) -> None:
+        channel = self._channels.get(data["id"])
+        if channel is not None:
+            channel._add_recipient(data["user"])
+
+    def parse_channel_group_leave(self, data: dict[str, Any]) -> None:
+        channel = self._channels.get(data["id"])
+        if channel is not None:
+            channel._remove_recipient(data["user"])
+
+    def parse_channel_start_typing(self, data: gw.ChannelStartTypingEventPayload) -> None:
+        if self.typing is not None:
+            self.typing.start(data["id"], data["user"])
+        else:
+            self._dispatch_typing("typing_start", data["id"], data["user"])
+
+    def parse_channel_stop_typing(self, data: gw.ChannelDeleteTypingEventPayload) -> None:
+        if self.typing is not None:
+            self.typing.stop(data["id"], data["user"])
+        else:
+            self._dispatch_typing("typing_stop", data["id"], data["user"])
+
+    def _dispatch_typing(self, event: str, channel_id: str, user_id: str) -> None:
+        self.dispatch(event, self._channels.get(channel_id), self._users.get(user_id))
+
+    def _dispatch_channel_activity(self, channel_id: str, user_ids: list[str]) -> None:
+        if not self.handles("channel_activity"):
+            return
+
+        users = [user for user in map(self._users.get, user_ids) if user is not None]
+        self.dispatch("channel_activity", self._channels.get(channel_id), users)
+
+    def parse_server_create(self, data: gw.ServerCreateEventPayload) -> None:
+        server = self.store_server(data["server"])
+
+        for channel in data.get("channels", ()):
+            self.store_channel(channel)
+
+        self.dispatch("server_join", server)
+
+    def parse_server_update(self, data: gw.ServerUpdateEventPayload) -> None:
+        server = self._servers.get(data["id"])
+        if server is None:
+            return
+
+        before = server._copy() if self.handles("server_update") else None
+        server._update(data.get("data", {}), data.get("clear"))
+        if before is not None:
+            self.dispatch("server_update", before, server)
+
+    def parse_server_delete(self, data: gw.ServerDeleteEventPayload) -> None:
+        server = self._remove_server(data["id"])
+        if server is not None:
+            self.dispatch("server_delete", server)
+
+    def parse_server_member_join(self, data: gw.ServerMemberJoinEventPayload) -> None:
+        member = self.store_member({"_id": {"server": data["id"], "user": data["user"]}})
+        self.dispatch("member_join", member)
+
+    def parse_server_member_update(self, data: gw.ServerMemberUpdateEventPayload) -> None:
+        member = self.get_member(data["id"]["server"], data["id"]["user"])
+        if member is None:
+            return
+
+        before = member._copy() if self.handles("member_update") else None
+        member._update(data.get("data", {}), data.get("clear"))
+        if before is not None:
+            self.dispatch("member_update", before, member)
+
+    def parse_server_member_leave(self, data: gw.ServerMemberLeaveEventPayload) -> None:
+        if data["user"] == self.user_id:
+            # We were removed from the server ourselves
+            server = self._remove_server(data["id"])
+            if server is not None:
+                self.dispatch("server_delete", server)
+            return
+
+        self._active_members.pop((data["id"], data["user"]), None)
+        member = self._members.get(data["id"], {}).pop(data["user"], None)
+        if member is not None:
+            self.dispatch("member_leave", member)
+
+    def parse_server_role_update(self, data: gw.ServerRoleUpdateEventPayload) -> None:
+        server = self._servers.get(data["id"])
+        if server is None:
+            return
+
+        role = server.get_role(data["role_id"])
+
+        if role is None:
+            role = Role(self, server.id, data["role_id"], data.get("data", {}))
+            server._put_role(role)
+            self.dispatch("role_create", role)
+            return
+
+        before = role._copy() if self.handles("role_update") else None
+        role._update(data.get("data", {}), data.get("clear"))
+        if before is not None:
+            self.dispatch("role_update", before, role)
+
+    def parse_server_role_delete(self, data: gw.ServerRoleDeleteEventPayload) -> None:
+        server = self._servers.get(data["id"])
+        if server is None:
+            return
+
+        role = server._pop_role(data["role_id"])
+        if role is not None:
+            self.dispatch("role_delete", role)
+
+    def parse_user_update(self, data: gw.UserUpdateEventPayload) -> None:
+        changes = data.get("data", {})
+        clear = data.get("clear")
+
+        if not self.client.intents.presence and _PRESENCE_FIELDS.issuperset(changes) and (
+            not clear or _PRESENCE_CLEAR.issuperset([clear] if isinstance(clear, str) else clear)
+        ):
+            return
+
+        user = self._users.get(data["id"])
+        if user is None:
+            return
+
+        was_online = user.online
+        before = user._copy() if self.handles("user_update") else None
+        user._update(changes, clear)
+
+        if was_online and not user.online and self.member_cache_policy.online:
+            for server_id, members in self._members.items():
+                if user.id in members:
+                    self._uncache_member(server_id, user.id)
+
+        if before is not None:
+            self.dispatch("user_update", before, user)
+
+    def parse_user_relationship(self, data: gw.UserRelationshipEventPayload) -> None:
+        user = self._users.get(data["id"])
+        if user is None:
+            return
+
+        before = user.relationship
+        user._update({"relationship": data["status"]})
+        self.dispatch("user_relationship_update", user, before, data["status"])
+
+    def parse_emoji_create(self, data: EmojiPayload) -> None:
+        self.store_emoji(data)
+
+    def parse_emoji_delete(self, data: dict[str, Any]) -> None:
+        self._emojis.pop(data["id"], None)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import copy
+import datetime
+import sys
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from .asset import Asset
+from .utils import _clear_cached_slots, _ulid_timestamp, cached_slot_property
+
+if TYPE_CHECKING:
+    from .state import ConnectionState
+    from .types.file import FilePayload
+    from .types.user import User as UserPayload
+
+__all__ = ("User", "ClientUser")
+
+
+class User:
+    """A Revolt user.
+
+    Fields are copied out of the payload into slots and the payload itself is
+    not kept. The avatar is only wrapped in an :class:`Asset` on first access.
+    """
+
+    __slots__ = (
+        "_state",
+        "id",
+        "name",
+        "discriminator",
+        "_display_name",
+        "_avatar",
+        "owner_id",
+        "badges",
+        "flags",
+        "online",
+        "relationship",
+        "presence",
+        "status_text",
+        "_cs_avatar",
+        "_cs_created_at",
+    )
+
+    def __init__(self, state: ConnectionState, data: UserPayload) -> None:
+        self._state: ConnectionState = state
+
+        self.id: str = sys.intern(data["_id"])
+        self.name: str = data["username"]
+        self.discriminator: str = data["discriminator"]
+        self._display_name: Optional[str] = None
+        self._avatar: Optional[FilePayload] = None
+        self.owner_id: Optional[str] = None
+        self.badges: int = 0
+        self.flags: int = 0
+        self.online: bool = False
+        self.relationship: Optional[str] = None
+        self.presence: Optional[str] = None
+        self.status_text: Optional[str] = None
+
+        self._update(data)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} id={self.id!r} name={self.name!r}>"
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, User) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def _update(self, data: dict[str, Any], clear: Union[str, list[str], None] = None) -> None:
+        if "username" in data:
+            self.name = data["username"]
+        if "discriminator" in data:
+            self.discriminator = data["discriminator"]
+        if "display_name" in data:
+            self._display_name = data["display_name"]
+        if "avatar" in data:
+            self._avatar = data["avatar"]
+        if "bot" in data:
+            self.owner_id = sys.intern(data["bot"]["owner"])
+        if "badges" in data:
+            self.badges = data["badges"]
+        if "flags" in data:
+            self.flags = data["flags"]
+        if "online" in data:
+            self.online = data["online"]
+        if "relationship" in data:
+            self.relationship = sys.intern(data["relationship"])
+        if "status" in data:
+            status = data["status"] or {}
+            presence = status.get("presence")
+            self.presence = sys.intern(presence) if presence is not None else None
+            self.status_text = status.get("text")
+
+        if clear:
+            for field in [clear] if isinstance(clear, str) else clear:
+                if field == "Avatar":
+                    self._avatar = None
+                elif field == "StatusText":
+                    self.status_text = None
+                elif field == "StatusPresence":
+                    self.presence = None
+                elif field == "DisplayName":
+                    self._display_name = None
+
+        _clear_cached_slots(self)
+
+    def _copy(self) -> User:
+        return copy.copy(self)
+
+    @property
+    def display_name(self) -> str:
+        return self._display_name or self.name
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    @property
+    def bot(self) -> bool:
+        return self.owner_id is not None
+
+    @property
+    def status(self) -> tuple[Optional[str], Optional[str]]:
+        """The user's presence and custom status text."""
+        return self.presence, self.status_text
+
+    @cached_slot_property("_cs_avatar")
+    def avatar(self) -> Optional[Asset]:
+        return Asset(self._state, self._avatar) if self._avatar is not None else None
+
+    @cached_slot_property("_cs_created_at")
+    def created_at(self) -> datetime.datetime:
+        return _ulid_timestamp(self.id)
+
+
+class ClientUser(User):
+    """The user the client is logged in as."""
+
+    __slots__ = ()
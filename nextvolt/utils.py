@@ -1,3 +1,19 @@
+from __future__ import annotations
+
+import datetime
+import json
+from typing import Any, Callable, Generic, Optional, TypeVar, Union
+
+try:
+    import msgpack
+except ImportError:
+    HAS_MSGPACK = False
+else:
+    HAS_MSGPACK = True
+
+__all__ = ("MISSING", "set_json_backend", "get_json_backend")
+
+
 class _MissingSentinel:
     def __eq__(self, _) -> bool:
         return False
@@ -8,4 +24,196 @@ class _MissingSentinel:
     def __repr__(self) -> str:
         return '...'
 
-MISSING: Any = _MissingSentinel()
\ No newline at end of file
+MISSING: Any = _MissingSentinel()
+
+T = TypeVar("T")
+T_co = TypeVar("T_co", covariant=True)
+
+
+class CachedSlotProperty(Generic[T, T_co]):
+    def __init__(self, name: str, function: Callable[[T], T_co]) -> None:
+        self.name = name
+        self.function = function
+        self.__doc__ = getattr(function, "__doc__")
+
+    def __get__(self, instance: Optional[T], owner: type[T]) -> Any:
+        if instance is None:
+            return self
+
+        try:
+            return getattr(instance, self.name)
+        except AttributeError:
+            value = self.function(instance)
+            setattr(instance, self.name, value)
+            return value
+
+
+def cached_slot_property(name: str) -> Callable[[Callable[[T], T_co]], CachedSlotProperty[T, T_co]]:
+    """Like ``functools.cached_property``, but stores the value in the ``__slots__`` entry ``name``."""
+
+    def decorator(func: Callable[[T], T_co]) -> CachedSlotProperty[T, T_co]:
+        return CachedSlotProperty(name, func)
+
+    return decorator
+
+
+def _clear_cached_slots(instance: Any) -> None:
+    # Drops every value computed by a cached_slot_property, so it's decoded again from the new payload
+    for klass in type(instance).__mro__:
+        for name in getattr(klass, "__slots__", ()):
+            if name.startswith("_cs_"):
+                try:
+                    delattr(instance, name)
+                except AttributeError:
+                    pass
+
+
+_ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_ULID_VALUES = {char: value for value, char in enumerate(_ULID_ALPHABET)}
+
+
+def _ulid_timestamp(ulid: str) -> datetime.datetime:
+    # the first 10 characters of a ULID are the creation time in ms, base32 encoded
+    ms = 0
+    for char in ulid[:10]:
+        ms = ms * 32 + _ULID_VALUES[char]
+    return datetime.datetime.fromtimestamp(ms / 1000, tz=datetime.timezone.utc)
+
+
+def _ulid_cursor(when: datetime.datetime, *, high: bool = False) -> str:
+    # The lowest (or highest) ULID at ``when``, so it sorts before (or after)
+    # every id created in that millisecond. Naive datetimes are taken as UTC.
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+
+    ms = int(when.timestamp() * 1000)
+    chars = []
+    for _ in range(10):
+        ms, value = divmod(ms, 32)
+        chars.append(_ULID_ALPHABET[value])
+
+    return "".join(reversed(chars)) + ("Z" if high else "0") * 16
+
+
+def _parse_timestamp(value: Union[str, int, None]) -> Optional[datetime.datetime]:
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return datetime.datetime.fromtimestamp(value / 1000, tz=datetime.timezone.utc)
+    return datetime.datetime.fromisoformat(value)
+
+
+# ``clear`` field names sent in *Update events, mapped to the payload keys they remove
+_CLEAR_FIELDS: dict[str, str] = {
+    "Icon": "icon",
+    "Banner": "banner",
+    "Description": "description",
+    "Nickname": "nickname",
+    "Avatar": "avatar",
+    "Colour": "colour",
+    "StatusText": "status",
+    "ProfileContent": "profile",
+    "ProfileBackground": "profile",
+    "DisplayName": "display_name",
+}
+
+
+def _apply_update(payload: dict[str, Any], data: dict[str, Any], clear: Union[str, list[str], None]) -> None:
+    payload.update(data)
+
+    if not clear:
+        return
+
+    for field in [clear] if isinstance(clear, str) else clear:
+        key = _CLEAR_FIELDS.get(field)
+        if key is not None:
+            payload.pop(key, None)
+
+
+# JSON backends, in order of preference when auto-detecting
+_JSON_BACKENDS = ("orjson", "msgspec", "ujson", "json")
+
+_json_backend: str = "json"
+_to_json: Callable[[Any], str]
+_to_json_bytes: Callable[[Any], bytes]
+_from_json: Callable[[Union[str, bytes]], Any]
+
+
+def _load_json_backend(name: str) -> tuple[Callable[[Any], str], Callable[[Any], bytes], Callable[[Union[str, bytes]], Any]]:
+    if name == "orjson":
+        import orjson
+
+        return (lambda obj: orjson.dumps(obj).decode("utf-8")), orjson.dumps, orjson.loads
+
+    if name == "msgspec":
+        import msgspec
+
+        encoder = msgspec.json.Encoder()
+        decoder = msgspec.json.Decoder()
+
+        def from_json(data: Union[str, bytes]) -> Any:
+            # msgspec's DecodeError isn't a ValueError like the other backends' errors
+            try:
+                return decoder.decode(data)
+            except msgspec.DecodeError as exc:
+                raise ValueError(str(exc)) from exc
+
+        return (lambda obj: encoder.encode(obj).decode("utf-8")), encoder.encode, from_json
+
+    if name == "ujson":
+        import ujson
+
+        def to_json(obj: Any) -> str:
+            return ujson.dumps(obj, ensure_ascii=False)
+
+        return to_json, (lambda obj: to_json(obj).encode("utf-8")), ujson.loads
+
+    if name == "json":
+        def to_json(obj: Any) -> str:
+            return json.dumps(obj, separators=(",", ":"), ensure_ascii=True)
+
+        return to_json, (lambda obj: to_json(obj).encode("utf-8")), json.loads
+
+    raise ValueError(f"Unknown JSON backend {name!r}, expected one of {', '.join(_JSON_BACKENDS)}")
+
+
+def set_json_backend(name: Optional[str] = None) -> str:
+    """Selects the library used to encode and decode REST and gateway JSON.
+
+    ``name`` is one of ``"orjson"``, ``"msgspec"``, ``"ujson"`` or ``"json"``. If it
+    is ``None``, the fastest installed library is picked. Returns the name of the
+    backend now in use.
+    """
+
+    global _json_backend, _to_json, _to_json_bytes, _from_json
+
+    if name is None:
+        for candidate in _JSON_BACKENDS:
+            try:
+                functions = _load_json_backend(candidate)
+            except ImportError:
+                continue
+            name = candidate
+            break
+    else:
+        functions = _load_json_backend(name)
+
+    _to_json, _to_json_bytes, _from_json = functions
+    _json_backend = name
+    return name
+
+
+def get_json_backend() -> str:
+    """Returns the name of the JSON library currently in use."""
+    return _json_backend
+
+
+set_json_backend()
+
+
+def _to_msgpack(obj: Any) -> bytes:
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def _from_msgpack(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Optional
+
+from .utils import MISSING
+
+__all__ = ("WaiterRegistry",)
+
+# where to look for each routing key on a dispatched payload or object
+_KEY_FIELDS: dict[str, tuple[str, ...]] = {
+    "message": ("message_id", "id", "_id"),
+    "channel": ("channel_id", "channel"),
+    "author": ("author_id", "author", "user_id", "user"),
+}
+
+# most selective first; a waiter is indexed under the first key it has
+_KEY_ORDER = ("message", "channel", "author")
+
+
+def _as_id(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+
+    if isinstance(value, dict):
+        return value.get("_id")
+
+    return getattr(value, "id", None)
+
+
+def _extract_key(kind: str, args: tuple[Any, ...]) -> Optional[str]:
+    fields = _KEY_FIELDS[kind]
+
+    for arg in args:
+        if isinstance(arg, dict):
+            for field in fields:
+                value = arg.get(field)
+                if value is not None:
+                    return _as_id(value)
+        elif arg is not None:
+            for field in fields:
+                value = getattr(arg, field, None)
+                if value is not None:
+                    return _as_id(value)
+
+    return None
+
+
+class _Waiter:
+    __slots__ = ("future", "check", "keys")
+
+    def __init__(self, future: asyncio.Future, check: Optional[Callable[..., bool]], keys: dict[str, str]) -> None:
+        self.future = future
+        self.check = check
+        self.keys = keys
+
+
+class WaiterRegistry:
+    """Routes dispatched events to pending :meth:`Client.wait_for` futures.
+
+    Waits that name a message, channel or author are indexed by that id, so an
+    event only runs the checks of the waits it can possibly satisfy. Waits with
+    only a ``check`` callable are evaluated for every event of their type, as
+    before. Finished, cancelled and timed-out futures remove themselves, and
+    ``on_empty`` is called with an event's name once its last waiter is gone.
+    """
+
+    def __init__(self, on_empty: Optional[Callable[[str], None]] = None) -> None:
+        self.on_empty: Optional[Callable[[str], None]] = on_empty
+        # event -> waiters without routing keys
+        self._unkeyed: dict[str, dict[_Waiter, None]] = {}
+        # event -> (kind, id) -> waiters
+        self._indexed: dict[str, dict[tuple[str, str], dict[_Waiter, None]]] = {}
+        # event -> kind -> number of waiters indexed by that kind
+        self._kinds: dict[str, dict[str, int]] = {}
+
+    def __contains__(self, event: str) -> bool:
+        return event in self._unkeyed or event in self._indexed
+
+    def add(
+        self,
+        event: str,
+        future: asyncio.Future,
+        check: Optional[Callable[..., bool]] = None,
+        **keys: Any
+    ) -> None:
+        routing = {kind: _as_id(value) for kind, value in keys.items() if value is not None}
+        for kind in routing:
+            if kind not in _KEY_FIELDS:
+                raise TypeError(f"Unknown wait_for key {kind!r}")
+
+        waiter = _Waiter(future, check, routing)
+
+        if not routing:
+            self._unkeyed.setdefault(event, {})[waiter] = None
+            future.add_done_callback(lambda _: self._remove_unkeyed(event, waiter))
+            return
+
+        kind = next(kind for kind in _KEY_ORDER if kind in routing)
+        index_key = (kind, routing[kind])
+
+        self._indexed.setdefault(event, {}).setdefault(index_key, {})[waiter] = None
+        kinds = self._kinds.setdefault(event, {})
+        kinds[kind] = kinds.get(kind, 0) + 1
+        future.add_done_callback(lambda _: self._remove_indexed(event, index_key, waiter))
+
+    def _remove_unkeyed(self, event: str, waiter: _Waiter) -> None:
+        waiters = self._unkeyed.get(event)
+        if waiters is None:
+            return
+
+        waiters.pop(waiter, None)
+        if not waiters:
+            del self._unkeyed[event]
+            self._removed_last(event)
+
+    def _remove_indexed(self, event: str, index_key: tuple[str, str], waiter: _Waiter) -> None:
+        index = self._indexed.get(event)
+        if index is None:
+            return
+
+        waiters = index.get(index_key)
+        if waiters is None or waiters.pop(waiter, MISSING) is MISSING:
+            return
+
+        if not waiters:
+            del index[index_key]
+            if not index:
+                del self._indexed[event]
+
+        kinds = self._kinds[event]
+        kind = index_key[0]
+        kinds[kind] -= 1
+        if not kinds[kind]:
+            del kinds[kind]
+            if not kinds:
+                del self._kinds[event]
+
+        self._removed_last(event)
+
+    def _removed_last(self, event: str) -> None:
+        if self.on_empty is not None and event not in self:
+            self.on_empty(event)
+
+    def dispatch(self, event: str, args: tuple[Any, ...]) -> None:
+        unkeyed = self._unkeyed.get(event)
+        index = self._indexed.get(event)
+        if not unkeyed and not index:
+            return
+
+        extracted: dict[str, Optional[str]] = {}
+        candidates: list[_Waiter] = []
+
+        if index:
+            for kind in self._kinds[event]:
+                value = extracted[kind] = _extract_key(kind, args)
+                if value is not None:
+                    waiters = index.get((kind, value))
+                    if waiters:
+                        candidates.extend(waiters)
+
+        if unkeyed:
+            candidates.extend(unkeyed)
+
+        for waiter in candidates:
+            future = waiter.future
+            if future.done():
+                continue
+
+            for kind, expected in waiter.keys.items():
+                if kind not in extracted:
+                    extracted[kind] = _extract_key(kind, args)
+                if extracted[kind] != expected:
+                    break
+            else:
+                try:
+                    result = waiter.check is None or waiter.check(*args)
+                except Exception as exc:
+                    future.set_exception(exc)
+                    continue
+
+                if result:
+                    if len(args) == 0:
+                        future.set_result(None)
+                    elif len(args) == 1:
+                        future.set_result(args[0])
+                    else:
+                        future.set_result(args)
+